@@ -4,6 +4,11 @@
 import os
 import sys
 import argparse
+import atexit
+import logging
+import logging.handlers
+import multiprocessing
+import queue
 from pathlib import Path
 
 # Windows : définir l'AppUserModelID pour que l'icône s'affiche dans la barre des tâches
@@ -25,6 +30,19 @@ from src.ui.main_window import MainWindow
 from src.stats.calculator import calculate_stats_from_file
 
 
+def setup_logging() -> None:
+    """Configure le logging : les threads de travail (import, watcher) ne font
+    que déposer leurs messages dans une file, écrits sur stderr par un thread dédié."""
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+    listener.start()
+    # Vide la file avant la sortie du processus
+    atexit.register(listener.stop)
+
+
 def main():
     """Point d'entrée principal."""
     parser = argparse.ArgumentParser(
@@ -45,6 +63,7 @@ def main():
         return 0
 
     # Mode GUI
+    setup_logging()
     app = QApplication(sys.argv)
     app.setApplicationName("PokerTH Tracker")
     app.setOrganizationName("PTHTracker")
@@ -118,4 +137,6 @@ def analyze_log(log_path: str) -> None:
 
 
 if __name__ == "__main__":
+    # Nécessaire pour les processus d'import dans l'exécutable PyInstaller
+    multiprocessing.freeze_support()
     sys.exit(main())
@@ -1,8 +1,9 @@
 """Parser des fichiers de log PokerTH (.pdb)."""
 
 import sqlite3
+import sys
 from pathlib import Path
-from typing import Generator
+from typing import Generator, Iterable
 
 from .models import HandAction, GameSession
 
@@ -63,6 +64,8 @@ class LogParser:
                 timeout=10
             )
             self._conn.row_factory = sqlite3.Row
+            # Le fichier appartient à PokerTH : aucune écriture ne doit partir d'ici
+            self._conn.execute("PRAGMA query_only=1")
         return self._conn
 
     def close(self) -> None:
@@ -85,8 +88,51 @@ class LogParser:
         except sqlite3.OperationalError:
             return 0
 
+    @staticmethod
+    def last_action_ids(
+        db_paths: Iterable[Path],
+    ) -> Generator[tuple[Path, int | sqlite3.Error], None, None]:
+        """Lit le plus grand ActionID de plusieurs fichiers avec une seule connexion.
+
+        Chaque fichier est attaché en lecture seule, interrogé puis détaché :
+        pas d'ouverture de connexion par fichier lors du parcours de l'import.
+
+        Yields:
+            (chemin, ActionID max) — 0 si la base est verrouillée ou sans
+            table Action, comme get_last_processed_action_id() — ou
+            (chemin, erreur) si le fichier ne peut pas être lu
+        """
+        conn = sqlite3.connect("file::memory:", uri=True)
+        try:
+            for db_path in db_paths:
+                try:
+                    conn.execute(
+                        "ATTACH DATABASE ? AS log",
+                        (Path(db_path).resolve().as_uri() + "?mode=ro",),
+                    )
+                except sqlite3.Error as e:
+                    yield db_path, e
+                    continue
+                try:
+                    row = conn.execute("SELECT MAX(ActionID) FROM log.Action").fetchone()
+                    result = row[0] if row and row[0] is not None else 0
+                except sqlite3.OperationalError:
+                    result = 0
+                except sqlite3.Error as e:
+                    result = e
+                finally:
+                    conn.execute("DETACH DATABASE log")
+                yield db_path, result
+        finally:
+            conn.close()
+
     def has_actions(self) -> bool:
         """Vérifie si le fichier de log contient au moins une action."""
+        # Fichier encore vide (ni pages, ni journal WAL) : inutile d'ouvrir SQLite
+        if self.db_path.stat().st_size == 0:
+            wal_path = self.db_path.with_name(self.db_path.name + "-wal")
+            if not wal_path.exists() or wal_path.stat().st_size == 0:
+                return False
         try:
             conn = self._connect()
             cursor = conn.execute("SELECT 1 FROM Action LIMIT 1")
@@ -118,13 +164,32 @@ class LogParser:
         conn = self._connect()
         cursor = conn.execute("SELECT Player, UniqueGameID FROM Player")
         for row in cursor:
-            name = row["Player"]
+            name = sys.intern(row["Player"])
             game_id = row["UniqueGameID"]
             if name not in players:
                 players[name] = set()
             players[name].add(game_id)
         return players
 
+    def get_hands_since(self, action_id: int) -> set[tuple[int, int]]:
+        """Retourne les (game_id, hand_id) ayant au moins une action d'ActionID > action_id."""
+        conn = self._connect()
+        cursor = conn.execute(
+            "SELECT DISTINCT UniqueGameID, HandID FROM Action WHERE ActionID > ?",
+            (action_id,)
+        )
+        return {(row["UniqueGameID"], row["HandID"]) for row in cursor}
+
+    def get_hand_first_action_id(self, game_id: int, hand_id: int) -> int:
+        """Retourne l'ActionID de la première action d'une main (0 si aucune)."""
+        conn = self._connect()
+        cursor = conn.execute(
+            "SELECT MIN(ActionID) FROM Action WHERE UniqueGameID = ? AND HandID = ?",
+            (game_id, hand_id)
+        )
+        row = cursor.fetchone()
+        return row[0] if row and row[0] is not None else 0
+
     def get_player_seat(self, game_id: int, player_name: str) -> int | None:
         """Récupère le siège d'un joueur dans une partie."""
         conn = self._connect()
@@ -300,7 +365,8 @@ class LogParser:
         cursor = conn.execute(
             "SELECT Player FROM Player WHERE UniqueGameID = (SELECT MAX(UniqueGameID) FROM Player)"
         )
-        return [row["Player"] for row in cursor]
+        # Noms internés : comparés aux clés des stats à chaque filtrage
+        return [sys.intern(row["Player"]) for row in cursor]
 
     def get_all_actions_by_player(self, player_name: str) -> Generator[HandAction, None, None]:
         """Récupère toutes les actions d'un joueur (tous rounds)."""
@@ -422,3 +488,184 @@ class LogParser:
             results.append((combo, position, n_players))
 
         return results
+
+
+class LogSlice:
+    """Vue en mémoire de quelques mains d'un log (mises à jour incrémentales).
+
+    La table Action des logs PokerTH n'est indexée que par ActionID : toute
+    requête filtrée par partie ou par main la parcourt entièrement. Les
+    actions des mains de la vue sont donc lues une seule fois, par une plage
+    d'ActionID, puis les méthodes de LogParser utilisées par StatsCalculator
+    sont servies depuis la mémoire, restreintes à ces mains.
+    """
+
+    def __init__(
+        self,
+        parser: LogParser,
+        hands: Iterable[tuple[int, int]],
+        min_action_id: int,
+    ):
+        """Charge les mains données.
+
+        Args:
+            parser: Parser du fichier de log
+            hands: Mains (game_id, hand_id) de la vue
+            min_action_id: ActionID de la première action de ces mains (ou moins)
+        """
+        self.hands = frozenset(hands)
+        conn = parser._connect()
+
+        # Actions des mains, par main et dans l'ordre des ActionID
+        self._actions: dict[tuple[int, int], list[HandAction]] = {hand: [] for hand in self.hands}
+        # Première ActionID de chaque main (borne de la prochaine lecture)
+        self.first_action_ids: dict[tuple[int, int], int] = {}
+        cursor = conn.execute(
+            "SELECT * FROM Action WHERE ActionID >= ? ORDER BY ActionID", (min_action_id,)
+        )
+        for row in cursor:
+            key = (row["UniqueGameID"], row["HandID"])
+            actions = self._actions.get(key)
+            if actions is None:
+                continue
+            if not actions:
+                self.first_action_ids[key] = row["ActionID"]
+            actions.append(HandAction(
+                hand_id=row["HandID"],
+                game_id=row["UniqueGameID"],
+                betting_round=row["BeRo"],
+                player_seat=row["Player"],
+                action=row["Action"],
+                amount=row["Amount"],
+            ))
+
+        # Joueurs assis dans les parties des mains : {game_id: {nom: siège}}
+        game_ids = {game_id for game_id, _ in self.hands}
+        self._seats: dict[int, dict[str, int]] = {game_id: {} for game_id in game_ids}
+        if game_ids:
+            placeholders = ",".join("?" * len(game_ids))
+            cursor = conn.execute(
+                f"SELECT UniqueGameID, Seat, Player FROM Player WHERE UniqueGameID IN ({placeholders})",
+                list(game_ids)
+            )
+            for row in cursor:
+                self._seats[row["UniqueGameID"]][sys.intern(row["Player"])] = row["Seat"]
+
+        # Stacks en début de main : une recherche par clé primaire (HandID, UniqueGameID) par main
+        seat_cols = ", ".join(f"Seat_{i}_Cash" for i in range(1, 11))
+        self._stacks: dict[tuple[int, int], sqlite3.Row] = {}
+        for game_id, hand_id in self.hands:
+            row = conn.execute(
+                f"SELECT {seat_cols} FROM Hand WHERE HandID = ? AND UniqueGameID = ?",
+                (hand_id, game_id)
+            ).fetchone()
+            if row is not None:
+                self._stacks[(game_id, hand_id)] = row
+
+    def subset(self, hands: Iterable[tuple[int, int]]) -> "LogSlice":
+        """Retourne la vue restreinte à certaines de ses mains, sans relire le log."""
+        view = LogSlice.__new__(LogSlice)
+        view.hands = self.hands.intersection(hands)
+        view._actions = {hand: self._actions[hand] for hand in view.hands}
+        view.first_action_ids = {
+            hand: action_id for hand, action_id in self.first_action_ids.items() if hand in view.hands
+        }
+        game_ids = {game_id for game_id, _ in view.hands}
+        view._seats = {game_id: self._seats[game_id] for game_id in game_ids}
+        view._stacks = {hand: row for hand, row in self._stacks.items() if hand in view.hands}
+        return view
+
+    def _player_games(self, player_name: str) -> dict[int, int]:
+        """{game_id: siège} du joueur dans les parties de la vue."""
+        return {
+            game_id: seats[player_name]
+            for game_id, seats in self._seats.items()
+            if player_name in seats
+        }
+
+    def get_players(self) -> dict[str, set[int]]:
+        """Comme LogParser.get_players(), pour les parties de la vue."""
+        players: dict[str, set[int]] = {}
+        for game_id, seats in self._seats.items():
+            for name in seats:
+                players.setdefault(name, set()).add(game_id)
+        return players
+
+    def get_player_seats(self, player_name: str) -> dict[int, int]:
+        """Comme LogParser.get_player_seats(), pour les parties de la vue."""
+        return self._player_games(player_name)
+
+    def get_hands_played_by_player(self, player_name: str) -> set[tuple[int, int]]:
+        """Comme LogParser.get_hands_played_by_player(), pour les mains de la vue."""
+        player_games = self._player_games(player_name)
+        return {
+            hand for hand, actions in self._actions.items()
+            if hand[0] in player_games
+            and any(a.player_seat == player_games[hand[0]] for a in actions)
+        }
+
+    def get_player_hand_stacks(self, player_name: str) -> dict[tuple[int, int], int]:
+        """Comme LogParser.get_player_hand_stacks(), pour les mains de la vue."""
+        player_games = self._player_games(player_name)
+        result = {}
+        for hand, row in self._stacks.items():
+            seat = player_games.get(hand[0])
+            if seat is not None:
+                stack = row[f"Seat_{seat}_Cash"]
+                if stack is not None:
+                    result[hand] = stack
+        return result
+
+    def _player_actions(self, player_name: str) -> Generator[HandAction, None, None]:
+        """Actions du joueur, par partie puis main puis ActionID (ordre de LogParser)."""
+        player_games = self._player_games(player_name)
+        for hand in sorted(self._actions):
+            seat = player_games.get(hand[0])
+            if seat is None:
+                continue
+            for action in self._actions[hand]:
+                if action.player_seat == seat:
+                    yield action
+
+    def get_preflop_actions_by_player(self, player_name: str) -> Generator[HandAction, None, None]:
+        """Comme LogParser.get_preflop_actions_by_player(), pour les mains de la vue."""
+        for action in self._player_actions(player_name):
+            if action.betting_round == 0:
+                yield action
+
+    def get_all_actions_by_player(self, player_name: str) -> Generator[HandAction, None, None]:
+        """Comme LogParser.get_all_actions_by_player(), pour les mains de la vue."""
+        return self._player_actions(player_name)
+
+    def get_actions(
+        self,
+        game_id: int | None = None,
+        hand_id: int | None = None,
+        betting_round: int | None = None,
+    ) -> Generator[HandAction, None, None]:
+        """Comme LogParser.get_actions(), pour les mains de la vue."""
+        if game_id is not None and hand_id is not None:
+            hand_actions = [self._actions.get((game_id, hand_id), [])]
+        else:
+            # Plusieurs mains : l'ordre des ActionID est celui des mains
+            hand_actions = [
+                actions for (g, h), actions in sorted(
+                    self._actions.items(), key=lambda item: self.first_action_ids.get(item[0], 0)
+                )
+                if (game_id is None or g == game_id) and (hand_id is None or h == hand_id)
+            ]
+        for actions in hand_actions:
+            for action in actions:
+                if betting_round is None or action.betting_round == betting_round:
+                    yield action
+
+    def hand_has_showdown(self, game_id: int, hand_id: int) -> bool:
+        """Comme LogParser.hand_has_showdown(), pour les mains de la vue."""
+        return any(a.betting_round == 4 for a in self._actions.get((game_id, hand_id), ()))
+
+    def get_showdown_winner(self, game_id: int, hand_id: int) -> int | None:
+        """Comme LogParser.get_showdown_winner(), pour les mains de la vue."""
+        for action in self._actions.get((game_id, hand_id), ()):
+            if action.betting_round == 4 and action.action == "wins":
+                return action.player_seat
+        return None
@@ -1,10 +1,11 @@
 """Modèles de données pour le tracker."""
 
-from dataclasses import dataclass, field
-from typing import Optional
+import math
+from dataclasses import dataclass, field, fields
+from typing import ClassVar, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class HandAction:
     """Action d'un joueur dans une main."""
 
@@ -16,10 +17,13 @@ class HandAction:
     amount: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerStats:
     """Statistiques agrégées d'un joueur."""
 
+    # Élément neutre pour + et - (défini après la classe)
+    ZERO: ClassVar["PlayerStats"]
+
     player_name: str
     total_hands: int = 0
     vpip_hands: int = 0  # Mains où le joueur a volontairement mis de l'argent preflop
@@ -56,7 +60,7 @@ class PlayerStats:
     def af(self) -> float:
         """AF: Aggression Factor = (bets + raises) / calls."""
         if self.total_calls == 0:
-            return float('inf') if self.total_bets > 0 else 0.0
+            return math.inf if self.total_bets > 0 else 0.0
         return self.total_bets / self.total_calls
 
     @property
@@ -103,12 +107,13 @@ class PlayerStats:
 
     def to_dict(self) -> dict:
         """Convertit en dictionnaire pour affichage."""
+        af = self.af
         return {
             "name": self.player_name,
             "hands": self.total_hands,
             "vpip": round(self.vpip, 1),
             "pfr": round(self.pfr, 1),
-            "af": round(self.af, 1) if self.af != float('inf') else "inf",
+            "af": "inf" if math.isinf(af) else round(af, 1),
             "three_bet": round(self.three_bet, 1),
             "cbet": round(self.cbet, 1),
             "fold_to_3bet": round(self.fold_to_3bet, 1),
@@ -118,6 +123,24 @@ class PlayerStats:
         }
 
 
+def _stats_operator(symbol: str):
+    """Génère l'opérateur champ à champ de PlayerStats (garde le nom de l'opérande gauche).
+
+    Le code est généré une fois avec tous les champs écrits en toutes lettres :
+    aucune boucle ni getattr par appel.
+    """
+    counters = [f.name for f in fields(PlayerStats) if f.name != "player_name"]
+    args = ", ".join(f"{name}=a.{name} {symbol} b.{name}" for name in counters)
+    namespace = {"PlayerStats": PlayerStats}
+    exec(f"def operator(a, b):\n    return PlayerStats(player_name=a.player_name, {args})", namespace)
+    return namespace["operator"]
+
+
+PlayerStats.__add__ = _stats_operator("+")
+PlayerStats.__sub__ = _stats_operator("-")
+PlayerStats.ZERO = PlayerStats(player_name="")
+
+
 @dataclass
 class GameSession:
     """Informations sur une session de jeu."""
@@ -2,11 +2,49 @@
 
 import json
 import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from dataclasses import fields
+from operator import attrgetter
 from pathlib import Path
+from typing import Iterable, Iterator
 
 from .models import PlayerStats
 
 
+# Colonnes de PlayerStats, dans l'ordre des champs (identiques dans player_stats
+# et imported_file_stats)
+_STATS_COLUMNS = tuple(f.name for f in fields(PlayerStats))
+_STATS_COLUMNS_SQL = ", ".join(_STATS_COLUMNS)
+_STATS_PLACEHOLDERS_SQL = ", ".join("?" * len(_STATS_COLUMNS))
+_stats_values = attrgetter(*_STATS_COLUMNS)
+
+
+class _TransactionConnection:
+    """Connexion du thread pendant StatsDB.transaction().
+
+    Les méthodes de StatsDB s'utilisent telles quelles : leurs commit() et
+    leurs blocs « with » ne valident rien, le commit unique est fait à la
+    fin de la transaction.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def __getattr__(self, name: str):
+        return getattr(self._conn, name)
+
+    def __enter__(self) -> "_TransactionConnection":
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+    def commit(self) -> None:
+        pass
+
+
 class StatsDB:
     """Gère la persistence des statistiques des joueurs."""
 
@@ -38,6 +76,28 @@ class StatsDB:
             last_processed TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
 
+        CREATE TABLE IF NOT EXISTS imported_file_stats (
+            log_path TEXT,
+            player_name TEXT,
+            total_hands INTEGER DEFAULT 0,
+            vpip_hands INTEGER DEFAULT 0,
+            pfr_hands INTEGER DEFAULT 0,
+            total_bets INTEGER DEFAULT 0,
+            total_calls INTEGER DEFAULT 0,
+            three_bet_opportunities INTEGER DEFAULT 0,
+            three_bet_made INTEGER DEFAULT 0,
+            cbet_opportunities INTEGER DEFAULT 0,
+            cbet_made INTEGER DEFAULT 0,
+            fold_to_3bet_opportunities INTEGER DEFAULT 0,
+            fold_to_3bet_made INTEGER DEFAULT 0,
+            fold_to_cbet_opportunities INTEGER DEFAULT 0,
+            fold_to_cbet_made INTEGER DEFAULT 0,
+            hands_saw_flop INTEGER DEFAULT 0,
+            hands_went_to_showdown INTEGER DEFAULT 0,
+            showdowns_won INTEGER DEFAULT 0,
+            PRIMARY KEY (log_path, player_name)
+        );
+
         CREATE TABLE IF NOT EXISTS player_ranges (
             player_name TEXT,
             combo TEXT,
@@ -69,20 +129,107 @@ class StatsDB:
         """Initialise la base de données."""
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Compteur de modifications de player_stats : invalide le cache de get_all_players_stats
+        self._version = 0
+        self._version_lock = threading.Lock()
+        self._all_stats_cache: tuple[int, dict[str, PlayerStats]] | None = None
+        # Connexion de chaque thread, et celle de sa transaction en cours
+        self._local = threading.local()
         self._init_db()
 
+    @property
+    def version(self) -> int:
+        """Numéro de version des stats joueurs, incrémenté à chaque écriture."""
+        return self._version
+
+    def _bump_version(self) -> None:
+        """Signale une écriture dans player_stats (à appeler après le commit)."""
+        with self._version_lock:
+            self._version += 1
+
+    def _in_transaction(self) -> bool:
+        """Indique si le thread courant est dans un bloc transaction()."""
+        return getattr(self._local, "transaction", None) is not None
+
     def _connect(self) -> sqlite3.Connection:
-        """Crée une connexion thread-safe."""
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        # Active le mode WAL pour de meilleures performances multi-thread
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA synchronous=NORMAL")
+        """Retourne la connexion du thread courant (ou celle de la transaction en cours).
+
+        Chaque thread (interface, watcher, import) garde sa propre connexion,
+        ouverte une seule fois : pas de reconnexion ni de PRAGMA par requête,
+        et aucune connexion n'est partagée entre threads.
+        """
+        shared = getattr(self._local, "transaction", None)
+        if shared is not None:
+            return shared
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # timeout : attend jusqu'à 30 s qu'un autre thread libère le verrou d'écriture
+            # (import en cours) au lieu d'échouer avec « database is locked »
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            self._local.conn = conn
         return conn
 
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Regroupe les écritures du bloc dans une seule transaction SQLite.
+
+        Toutes les méthodes appelées depuis ce thread pendant le bloc partagent
+        une connexion ; un seul commit (et donc une seule synchronisation disque)
+        est fait à la sortie, ou un rollback si une exception s'échappe.
+        Les appels imbriqués rejoignent la transaction englobante.
+        """
+        if getattr(self._local, "transaction", None) is not None:
+            yield
+            return
+
+        conn = self._connect()
+        # IMMEDIATE : verrou d'écriture pris dès le début (busy_timeout s'applique),
+        # les lectures du bloc voient donc le même état que ses écritures
+        conn.execute("BEGIN IMMEDIATE")
+        self._local.transaction = _TransactionConnection(conn)
+        try:
+            yield
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._local.transaction = None
+            # Les lectures faites pendant la transaction ont pu voir un état non validé
+            self._bump_version()
+
+    @contextmanager
+    def savepoint(self) -> Iterator[None]:
+        """Rend les écritures du bloc atomiques à l'intérieur de transaction().
+
+        Si une exception s'échappe du bloc, seules ses écritures sont annulées
+        (ROLLBACK TO) et la transaction englobante peut continuer.
+        Hors transaction, équivaut à transaction().
+        """
+        conn = getattr(self._local, "transaction", None)
+        if conn is None:
+            with self.transaction():
+                yield
+            return
+
+        conn.execute("SAVEPOINT stats_savepoint")
+        try:
+            yield
+        except BaseException:
+            conn.execute("ROLLBACK TO stats_savepoint")
+            conn.execute("RELEASE stats_savepoint")
+            raise
+        conn.execute("RELEASE stats_savepoint")
+
     def _init_db(self) -> None:
         """Initialise le schéma de la base."""
         with self._connect() as conn:
+            # Le mode WAL est persistant dans le fichier : activé une fois ici,
+            # il permet aux lectures de ne pas attendre les écritures
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.executescript(self.SCHEMA)
             # Exécute les migrations pour les bases existantes
             for migration in self.MIGRATIONS:
@@ -90,8 +237,47 @@ class StatsDB:
                     conn.execute(migration)
                 except sqlite3.OperationalError:
                     pass  # Colonne existe déjà
+            self._migrate_stats_json(conn)
             conn.commit()
 
+    def _migrate_stats_json(self, conn: sqlite3.Connection) -> None:
+        """Déplace les baselines JSON (anciennes versions) vers la table imported_file_stats."""
+        rows = conn.execute(
+            "SELECT log_path, stats_json FROM processed_logs WHERE stats_json IS NOT NULL"
+        ).fetchall()
+        for row in rows:
+            data = json.loads(row["stats_json"])
+            self._write_file_stats(
+                conn, row["log_path"],
+                {name: PlayerStats(**player_data) for name, player_data in data.items()},
+            )
+        if rows:
+            conn.execute("UPDATE processed_logs SET stats_json = NULL")
+
+    @staticmethod
+    def _row_to_stats(row: sqlite3.Row) -> PlayerStats:
+        """Construit un PlayerStats depuis une ligne de player_stats."""
+        return PlayerStats(
+            # Noms internés : partagés avec ceux du parser (clés de dict, sets de table)
+            player_name=sys.intern(row["player_name"]),
+            total_hands=row["total_hands"],
+            vpip_hands=row["vpip_hands"],
+            pfr_hands=row["pfr_hands"],
+            total_bets=row["total_bets"],
+            total_calls=row["total_calls"],
+            three_bet_opportunities=row["three_bet_opportunities"],
+            three_bet_made=row["three_bet_made"],
+            cbet_opportunities=row["cbet_opportunities"],
+            cbet_made=row["cbet_made"],
+            fold_to_3bet_opportunities=row["fold_to_3bet_opportunities"],
+            fold_to_3bet_made=row["fold_to_3bet_made"],
+            fold_to_cbet_opportunities=row["fold_to_cbet_opportunities"],
+            fold_to_cbet_made=row["fold_to_cbet_made"],
+            hands_saw_flop=row["hands_saw_flop"],
+            hands_went_to_showdown=row["hands_went_to_showdown"],
+            showdowns_won=row["showdowns_won"],
+        )
+
     def get_player_stats(self, player_name: str) -> PlayerStats | None:
         """Récupère les stats d'un joueur."""
         with self._connect() as conn:
@@ -101,53 +287,60 @@ class StatsDB:
             )
             row = cursor.fetchone()
             if row:
-                return PlayerStats(
-                    player_name=row["player_name"],
-                    total_hands=row["total_hands"],
-                    vpip_hands=row["vpip_hands"],
-                    pfr_hands=row["pfr_hands"],
-                    total_bets=row["total_bets"],
-                    total_calls=row["total_calls"],
-                    three_bet_opportunities=row["three_bet_opportunities"],
-                    three_bet_made=row["three_bet_made"],
-                    cbet_opportunities=row["cbet_opportunities"],
-                    cbet_made=row["cbet_made"],
-                    fold_to_3bet_opportunities=row["fold_to_3bet_opportunities"],
-                    fold_to_3bet_made=row["fold_to_3bet_made"],
-                    fold_to_cbet_opportunities=row["fold_to_cbet_opportunities"],
-                    fold_to_cbet_made=row["fold_to_cbet_made"],
-                    hands_saw_flop=row["hands_saw_flop"],
-                    hands_went_to_showdown=row["hands_went_to_showdown"],
-                    showdowns_won=row["showdowns_won"],
-                )
+                return self._row_to_stats(row)
         return None
 
+    def get_players_stats(self, player_names: Iterable[str]) -> dict[str, PlayerStats]:
+        """Récupère les stats de quelques joueurs (ceux d'une table) en une requête.
+
+        Servi depuis le cache de get_all_players_stats() s'il est à jour.
+        Les joueurs absents de la base ne figurent pas dans le résultat.
+        """
+        names = list(player_names)
+        cached = None if self._in_transaction() else self._all_stats_cache
+        if cached is not None and cached[0] == self._version:
+            all_stats = cached[1]
+            return {name: all_stats[name] for name in names if name in all_stats}
+        if not names:
+            return {}
+
+        placeholders = ",".join("?" * len(names))
+        with self._connect() as conn:
+            cursor = conn.execute(
+                f"SELECT * FROM player_stats WHERE player_name IN ({placeholders})",
+                names
+            )
+            stats = {}
+            for row in cursor:
+                player_stats = self._row_to_stats(row)
+                stats[player_stats.player_name] = player_stats
+        return stats
+
     def get_all_players_stats(self) -> dict[str, PlayerStats]:
-        """Récupère les stats de tous les joueurs."""
+        """Récupère les stats de tous les joueurs.
+
+        Le résultat est mis en cache jusqu'à la prochaine écriture ; chaque
+        appel renvoie une copie du dictionnaire, les PlayerStats étant partagés.
+        Pendant une transaction de ce thread, le cache n'est ni lu ni rempli :
+        la lecture voit des écritures pas encore validées (et peut-être annulées).
+        """
+        in_transaction = self._in_transaction()
+        version = self._version
+        cached = None if in_transaction else self._all_stats_cache
+        if cached is not None and cached[0] == version:
+            return dict(cached[1])
+
         stats: dict[str, PlayerStats] = {}
         with self._connect() as conn:
             cursor = conn.execute("SELECT * FROM player_stats ORDER BY total_hands DESC")
             for row in cursor:
-                stats[row["player_name"]] = PlayerStats(
-                    player_name=row["player_name"],
-                    total_hands=row["total_hands"],
-                    vpip_hands=row["vpip_hands"],
-                    pfr_hands=row["pfr_hands"],
-                    total_bets=row["total_bets"],
-                    total_calls=row["total_calls"],
-                    three_bet_opportunities=row["three_bet_opportunities"],
-                    three_bet_made=row["three_bet_made"],
-                    cbet_opportunities=row["cbet_opportunities"],
-                    cbet_made=row["cbet_made"],
-                    fold_to_3bet_opportunities=row["fold_to_3bet_opportunities"],
-                    fold_to_3bet_made=row["fold_to_3bet_made"],
-                    fold_to_cbet_opportunities=row["fold_to_cbet_opportunities"],
-                    fold_to_cbet_made=row["fold_to_cbet_made"],
-                    hands_saw_flop=row["hands_saw_flop"],
-                    hands_went_to_showdown=row["hands_went_to_showdown"],
-                    showdowns_won=row["showdowns_won"],
-                )
-        return stats
+                player_stats = self._row_to_stats(row)
+                stats[player_stats.player_name] = player_stats
+        if in_transaction:
+            return stats
+        # Version lue avant la requête : une écriture concurrente invalidera ce cache
+        self._all_stats_cache = (version, stats)
+        return dict(stats)
 
     def save_player_stats(self, stats: PlayerStats) -> None:
         """Sauvegarde les stats d'un joueur (insert ou update)."""
@@ -198,86 +391,87 @@ class StatsDB:
                 stats.showdowns_won,
             ))
             conn.commit()
+        self._bump_version()
 
     def save_all_stats(self, all_stats: dict[str, PlayerStats]) -> None:
         """Sauvegarde les stats de plusieurs joueurs."""
         with self._connect() as conn:
-            for stats in all_stats.values():
-                conn.execute("""
-                    INSERT INTO player_stats
-                        (player_name, total_hands, vpip_hands, pfr_hands, total_bets, total_calls,
-                         three_bet_opportunities, three_bet_made, cbet_opportunities, cbet_made,
-                         fold_to_3bet_opportunities, fold_to_3bet_made,
-                         fold_to_cbet_opportunities, fold_to_cbet_made,
-                         hands_saw_flop, hands_went_to_showdown, showdowns_won)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ON CONFLICT(player_name) DO UPDATE SET
-                        total_hands = excluded.total_hands,
-                        vpip_hands = excluded.vpip_hands,
-                        pfr_hands = excluded.pfr_hands,
-                        total_bets = excluded.total_bets,
-                        total_calls = excluded.total_calls,
-                        three_bet_opportunities = excluded.three_bet_opportunities,
-                        three_bet_made = excluded.three_bet_made,
-                        cbet_opportunities = excluded.cbet_opportunities,
-                        cbet_made = excluded.cbet_made,
-                        fold_to_3bet_opportunities = excluded.fold_to_3bet_opportunities,
-                        fold_to_3bet_made = excluded.fold_to_3bet_made,
-                        fold_to_cbet_opportunities = excluded.fold_to_cbet_opportunities,
-                        fold_to_cbet_made = excluded.fold_to_cbet_made,
-                        hands_saw_flop = excluded.hands_saw_flop,
-                        hands_went_to_showdown = excluded.hands_went_to_showdown,
-                        showdowns_won = excluded.showdowns_won,
-                        last_updated = CURRENT_TIMESTAMP
-                """, (
-                    stats.player_name,
-                    stats.total_hands,
-                    stats.vpip_hands,
-                    stats.pfr_hands,
-                    stats.total_bets,
-                    stats.total_calls,
-                    stats.three_bet_opportunities,
-                    stats.three_bet_made,
-                    stats.cbet_opportunities,
-                    stats.cbet_made,
-                    stats.fold_to_3bet_opportunities,
-                    stats.fold_to_3bet_made,
-                    stats.fold_to_cbet_opportunities,
-                    stats.fold_to_cbet_made,
-                    stats.hands_saw_flop,
-                    stats.hands_went_to_showdown,
-                    stats.showdowns_won,
-                ))
+            conn.executemany("""
+                INSERT INTO player_stats
+                    (player_name, total_hands, vpip_hands, pfr_hands, total_bets, total_calls,
+                     three_bet_opportunities, three_bet_made, cbet_opportunities, cbet_made,
+                     fold_to_3bet_opportunities, fold_to_3bet_made,
+                     fold_to_cbet_opportunities, fold_to_cbet_made,
+                     hands_saw_flop, hands_went_to_showdown, showdowns_won)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(player_name) DO UPDATE SET
+                    total_hands = excluded.total_hands,
+                    vpip_hands = excluded.vpip_hands,
+                    pfr_hands = excluded.pfr_hands,
+                    total_bets = excluded.total_bets,
+                    total_calls = excluded.total_calls,
+                    three_bet_opportunities = excluded.three_bet_opportunities,
+                    three_bet_made = excluded.three_bet_made,
+                    cbet_opportunities = excluded.cbet_opportunities,
+                    cbet_made = excluded.cbet_made,
+                    fold_to_3bet_opportunities = excluded.fold_to_3bet_opportunities,
+                    fold_to_3bet_made = excluded.fold_to_3bet_made,
+                    fold_to_cbet_opportunities = excluded.fold_to_cbet_opportunities,
+                    fold_to_cbet_made = excluded.fold_to_cbet_made,
+                    hands_saw_flop = excluded.hands_saw_flop,
+                    hands_went_to_showdown = excluded.hands_went_to_showdown,
+                    showdowns_won = excluded.showdowns_won,
+                    last_updated = CURRENT_TIMESTAMP
+            """, map(_stats_values, all_stats.values()))
             conn.commit()
+        self._bump_version()
+
+    def merge_all_stats(self, all_stats: Iterable[PlayerStats]) -> None:
+        """Ajoute les stats de plusieurs joueurs aux totaux existants.
+
+        Une seule instruction (UPSERT additif) exécutée pour tous les joueurs :
+        ni lecture préalable ni aller-retour par joueur.
+        """
+        with self._connect() as conn:
+            conn.executemany("""
+                INSERT INTO player_stats
+                    (player_name, total_hands, vpip_hands, pfr_hands, total_bets, total_calls,
+                     three_bet_opportunities, three_bet_made, cbet_opportunities, cbet_made,
+                     fold_to_3bet_opportunities, fold_to_3bet_made,
+                     fold_to_cbet_opportunities, fold_to_cbet_made,
+                     hands_saw_flop, hands_went_to_showdown, showdowns_won)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(player_name) DO UPDATE SET
+                    total_hands = total_hands + excluded.total_hands,
+                    vpip_hands = vpip_hands + excluded.vpip_hands,
+                    pfr_hands = pfr_hands + excluded.pfr_hands,
+                    total_bets = total_bets + excluded.total_bets,
+                    total_calls = total_calls + excluded.total_calls,
+                    three_bet_opportunities = three_bet_opportunities + excluded.three_bet_opportunities,
+                    three_bet_made = three_bet_made + excluded.three_bet_made,
+                    cbet_opportunities = cbet_opportunities + excluded.cbet_opportunities,
+                    cbet_made = cbet_made + excluded.cbet_made,
+                    fold_to_3bet_opportunities = fold_to_3bet_opportunities + excluded.fold_to_3bet_opportunities,
+                    fold_to_3bet_made = fold_to_3bet_made + excluded.fold_to_3bet_made,
+                    fold_to_cbet_opportunities = fold_to_cbet_opportunities + excluded.fold_to_cbet_opportunities,
+                    fold_to_cbet_made = fold_to_cbet_made + excluded.fold_to_cbet_made,
+                    hands_saw_flop = hands_saw_flop + excluded.hands_saw_flop,
+                    hands_went_to_showdown = hands_went_to_showdown + excluded.hands_went_to_showdown,
+                    showdowns_won = showdowns_won + excluded.showdowns_won,
+                    last_updated = CURRENT_TIMESTAMP
+            """, map(_stats_values, all_stats))
+            conn.commit()
+        self._bump_version()
 
     def merge_stats(self, new_stats: PlayerStats) -> PlayerStats:
-        """Fusionne de nouvelles stats avec les stats existantes."""
-        existing = self.get_player_stats(new_stats.player_name)
-        if existing:
-            merged = PlayerStats(
-                player_name=new_stats.player_name,
-                total_hands=existing.total_hands + new_stats.total_hands,
-                vpip_hands=existing.vpip_hands + new_stats.vpip_hands,
-                pfr_hands=existing.pfr_hands + new_stats.pfr_hands,
-                total_bets=existing.total_bets + new_stats.total_bets,
-                total_calls=existing.total_calls + new_stats.total_calls,
-                three_bet_opportunities=existing.three_bet_opportunities + new_stats.three_bet_opportunities,
-                three_bet_made=existing.three_bet_made + new_stats.three_bet_made,
-                cbet_opportunities=existing.cbet_opportunities + new_stats.cbet_opportunities,
-                cbet_made=existing.cbet_made + new_stats.cbet_made,
-                fold_to_3bet_opportunities=existing.fold_to_3bet_opportunities + new_stats.fold_to_3bet_opportunities,
-                fold_to_3bet_made=existing.fold_to_3bet_made + new_stats.fold_to_3bet_made,
-                fold_to_cbet_opportunities=existing.fold_to_cbet_opportunities + new_stats.fold_to_cbet_opportunities,
-                fold_to_cbet_made=existing.fold_to_cbet_made + new_stats.fold_to_cbet_made,
-                hands_saw_flop=existing.hands_saw_flop + new_stats.hands_saw_flop,
-                hands_went_to_showdown=existing.hands_went_to_showdown + new_stats.hands_went_to_showdown,
-                showdowns_won=existing.showdowns_won + new_stats.showdowns_won,
-            )
-            self.save_player_stats(merged)
-            return merged
-        else:
-            self.save_player_stats(new_stats)
-            return new_stats
+        """Fusionne de nouvelles stats avec les stats existantes.
+
+        L'addition est faite par l'UPSERT de merge_all_stats() (player_name
+        est la clé primaire) ; seul le total fusionné est relu.
+        """
+        with self.transaction():
+            self.merge_all_stats((new_stats,))
+            return self.get_player_stats(new_stats.player_name)
 
     def get_last_processed_action(self, log_path: str) -> int:
         """Récupère le dernier ActionID traité pour un fichier log."""
@@ -293,22 +487,34 @@ class StatsDB:
         self,
         log_path: str,
         action_id: int,
-        stats_json: str | None = None,
+        file_stats: dict[str, PlayerStats] | None = None,
         ranges_json: str | None = None,
     ) -> None:
         """Enregistre le dernier ActionID traité, les stats et les ranges du fichier."""
         with self._connect() as conn:
             conn.execute("""
-                INSERT INTO processed_logs (log_path, last_action_id, stats_json, ranges_json)
-                VALUES (?, ?, ?, ?)
+                INSERT INTO processed_logs (log_path, last_action_id, ranges_json)
+                VALUES (?, ?, ?)
                 ON CONFLICT(log_path) DO UPDATE SET
                     last_action_id = excluded.last_action_id,
-                    stats_json = excluded.stats_json,
                     ranges_json = excluded.ranges_json,
                     last_processed = CURRENT_TIMESTAMP
-            """, (log_path, action_id, stats_json, ranges_json))
+            """, (log_path, action_id, ranges_json))
+            self._write_file_stats(conn, log_path, file_stats or {})
             conn.commit()
 
+    @staticmethod
+    def _write_file_stats(
+        conn: sqlite3.Connection, log_path: str, file_stats: dict[str, PlayerStats]
+    ) -> None:
+        """Remplace les lignes de imported_file_stats d'un fichier (une ligne par joueur)."""
+        conn.execute("DELETE FROM imported_file_stats WHERE log_path = ?", (log_path,))
+        conn.executemany(
+            f"INSERT INTO imported_file_stats (log_path, {_STATS_COLUMNS_SQL}) "
+            f"VALUES (?, {_STATS_PLACEHOLDERS_SQL})",
+            [(log_path, *_stats_values(stats)) for stats in file_stats.values()],
+        )
+
     def get_file_ranges(self, log_path: str) -> dict[str, list] | None:
         """Récupère les ranges par joueur stockées pour un fichier log."""
         with self._connect() as conn:
@@ -323,8 +529,12 @@ class StatsDB:
 
     def subtract_stats(self, stats: PlayerStats) -> None:
         """Soustrait les stats d'un joueur des totaux globaux (mise à jour incrémentale)."""
+        self.subtract_all_stats((stats,))
+
+    def subtract_all_stats(self, all_stats: Iterable[PlayerStats]) -> None:
+        """Soustrait les stats de plusieurs joueurs des totaux globaux (une seule instruction)."""
         with self._connect() as conn:
-            conn.execute("""
+            conn.executemany("""
                 UPDATE player_stats SET
                     total_hands                  = MAX(0, total_hands - ?),
                     vpip_hands                   = MAX(0, vpip_hands - ?),
@@ -344,17 +554,21 @@ class StatsDB:
                     showdowns_won                = MAX(0, showdowns_won - ?),
                     last_updated                 = CURRENT_TIMESTAMP
                 WHERE player_name = ?
-            """, (
-                stats.total_hands, stats.vpip_hands, stats.pfr_hands,
-                stats.total_bets, stats.total_calls,
-                stats.three_bet_opportunities, stats.three_bet_made,
-                stats.cbet_opportunities, stats.cbet_made,
-                stats.fold_to_3bet_opportunities, stats.fold_to_3bet_made,
-                stats.fold_to_cbet_opportunities, stats.fold_to_cbet_made,
-                stats.hands_saw_flop, stats.hands_went_to_showdown, stats.showdowns_won,
-                stats.player_name,
-            ))
+            """, [
+                (
+                    stats.total_hands, stats.vpip_hands, stats.pfr_hands,
+                    stats.total_bets, stats.total_calls,
+                    stats.three_bet_opportunities, stats.three_bet_made,
+                    stats.cbet_opportunities, stats.cbet_made,
+                    stats.fold_to_3bet_opportunities, stats.fold_to_3bet_made,
+                    stats.fold_to_cbet_opportunities, stats.fold_to_cbet_made,
+                    stats.hands_saw_flop, stats.hands_went_to_showdown, stats.showdowns_won,
+                    stats.player_name,
+                )
+                for stats in all_stats
+            ])
             conn.commit()
+        self._bump_version()
 
     def subtract_file_ranges(self, ranges: dict[str, list]) -> None:
         """Soustrait les ranges d'un fichier des compteurs globaux."""
@@ -376,14 +590,14 @@ class StatsDB:
         """Charge les stats importées pour un fichier log depuis le baseline persisté."""
         with self._connect() as conn:
             cursor = conn.execute(
-                "SELECT stats_json FROM processed_logs WHERE log_path = ?",
+                "SELECT * FROM imported_file_stats WHERE log_path = ?",
                 (log_path,)
             )
-            row = cursor.fetchone()
-            if row and row["stats_json"]:
-                data = json.loads(row["stats_json"])
-                return {name: PlayerStats(**player_data) for name, player_data in data.items()}
-        return None
+            stats = {}
+            for row in cursor:
+                player_stats = self._row_to_stats(row)
+                stats[player_stats.player_name] = player_stats
+        return stats or None
 
     def get_all_processed_log_paths(self) -> list[str]:
         """Retourne tous les chemins de fichiers log traités."""
@@ -426,5 +640,7 @@ class StatsDB:
         with self._connect() as conn:
             conn.execute("DELETE FROM player_stats")
             conn.execute("DELETE FROM processed_logs")
+            conn.execute("DELETE FROM imported_file_stats")
             conn.execute("DELETE FROM player_ranges")
             conn.commit()
+        self._bump_version()
@@ -3,10 +3,31 @@
 from collections import defaultdict
 from pathlib import Path
 
-from ..database.log_parser import LogParser
+from ..database.log_parser import LogParser, LogSlice
 from ..database.models import PlayerStats, HandAction
 
 
+def _replace_contribution(
+    stats: dict[str, PlayerStats],
+    old: dict[str, PlayerStats],
+    new: dict[str, PlayerStats],
+) -> None:
+    """Remplace dans stats la contribution old de quelques mains par leur contribution new.
+
+    Les PlayerStats modifiés sont de nouveaux objets : ceux déjà émis vers
+    l'interface ne changent pas sous ses pieds.
+    """
+    zero = PlayerStats.ZERO
+    for name in old.keys() | new.keys():
+        base = stats.get(name) or PlayerStats(player_name=name)
+        stats[name] = base + new.get(name, zero) - old.get(name, zero)
+
+
+def _hands_stats(view: LogSlice) -> dict[str, PlayerStats]:
+    """Contribution des mains d'une vue aux stats des joueurs de leurs parties."""
+    return StatsCalculator(view).calculate_all_players_stats()
+
+
 class StatsCalculator:
     """Calcule les statistiques VPIP, PFR, AF, 3-Bet, C-Bet, etc. pour chaque joueur."""
 
@@ -29,9 +50,17 @@ class StatsCalculator:
     # Actions de fold
     FOLD_ACTIONS = {"folds"}
 
-    def __init__(self, parser: LogParser):
+    def __init__(self, parser: LogParser | LogSlice):
         """Initialise le calculateur avec un parser."""
         self.parser = parser
+        # Mains pouvant encore recevoir des actions (celles touchées par la
+        # dernière mise à jour incrémentale), leur contribution par joueur et
+        # l'ActionID de leur première action
+        self._open_hands: frozenset[tuple[int, int]] = frozenset()
+        self._open_stats: dict[str, PlayerStats] = {}
+        self._open_from = 0
+        # Main la plus récente déjà comptée
+        self._last_hand: tuple[int, int] | None = None
 
     def calculate_player_stats(self, player_name: str) -> PlayerStats:
         """Calcule les statistiques complètes d'un joueur.
@@ -412,6 +441,73 @@ class StatsCalculator:
             for player_name in players
         }
 
+    def update_stats(
+        self, prev_stats: dict[str, PlayerStats], since_action_id: int
+    ) -> dict[str, PlayerStats]:
+        """Met à jour les stats de tous les joueurs avec les actions d'ActionID > since_action_id.
+
+        Seules les mains ayant reçu de nouvelles actions (et celles encore
+        ouvertes à la mise à jour précédente) sont recalculées ; leur ancienne
+        contribution est remplacée par la nouvelle. Le résultat est identique
+        à calculate_all_players_stats().
+
+        Les mains recalculées sont lues une seule fois (LogSlice, à partir de
+        la première action des mains ouvertes) : le coût dépend des nouvelles
+        actions, pas de la taille du fichier.
+
+        Args:
+            prev_stats: Stats retournées par l'appel précédent (non modifiées)
+            since_action_id: Dernier ActionID pris en compte dans prev_stats
+
+        Returns:
+            Stats de tous les joueurs du fichier
+        """
+        touched = self.parser.get_hands_since(since_action_id)
+        last_hand = max(touched, default=self._last_hand)
+
+        # Une main déjà comptée mais plus ouverte a changé : recalcul complet
+        reopened = self._last_hand is not None and any(
+            hand <= self._last_hand and hand not in self._open_hands for hand in touched
+        )
+        if since_action_id <= 0 or not prev_stats or reopened:
+            stats = self.calculate_all_players_stats()
+            if last_hand is None:
+                self._open_hands, self._open_stats = frozenset(), {}
+            else:
+                first_action_id = self.parser.get_hand_first_action_id(*last_hand)
+                view = LogSlice(self.parser, {last_hand}, first_action_id)
+                self._open_hands = view.hands
+                self._open_stats = _hands_stats(view)
+                self._open_from = first_action_id
+            self._last_hand = last_hand
+            return stats
+
+        # Les mains ouvertes non touchées sont recalculées une dernière fois :
+        # leur ligne Hand a pu être complétée après leur dernière action
+        new_from = since_action_id + 1
+        view = LogSlice(
+            self.parser,
+            touched | self._open_hands,
+            min(self._open_from, new_from) if self._open_hands else new_from,
+        )
+        recomputed = _hands_stats(view)
+        stats = dict(prev_stats)
+        _replace_contribution(stats, self._open_stats, recomputed)
+
+        if view.hands != touched:
+            view = view.subset(touched)
+            recomputed = _hands_stats(view)
+        self._open_hands = view.hands
+        self._open_stats = recomputed
+        self._open_from = min(view.first_action_ids.values(), default=new_from)
+        self._last_hand = last_hand
+
+        # Joueurs assis sans aucune main jouée (présents dans le calcul complet)
+        for player_name in self.parser.get_players():
+            if player_name not in stats:
+                stats[player_name] = PlayerStats(player_name=player_name)
+        return stats
+
     def calculate_table_players_stats(self) -> dict[str, PlayerStats]:
         """Calcule les stats des joueurs de la table actuelle."""
         current_players = self.parser.get_current_table_players()
@@ -426,3 +522,25 @@ def calculate_stats_from_file(db_path: Path | str) -> dict[str, PlayerStats]:
     parser = LogParser(db_path)
     calculator = StatsCalculator(parser)
     return calculator.calculate_all_players_stats()
+
+
+def parse_log_file(db_path: Path | str) -> tuple[int, dict[str, PlayerStats], dict[str, list]]:
+    """Calcule les stats et les ranges d'un fichier de log.
+
+    Fonction de module (picklable) pour être exécutée dans un processus
+    séparé lors de l'import de l'historique.
+
+    Returns:
+        (dernier ActionID, stats par joueur, combos VPIP par joueur)
+    """
+    parser = LogParser(db_path)
+    try:
+        last_action_id = parser.get_last_processed_action_id()
+        stats = StatsCalculator(parser).calculate_all_players_stats()
+        ranges = {
+            player_name: [list(c) for c in parser.get_player_vpip_combos(player_name)]
+            for player_name in stats
+        }
+        return last_action_id, stats, ranges
+    finally:
+        parser.close()
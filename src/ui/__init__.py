@@ -1,6 +1,20 @@
 """Module d'interface utilisateur."""
 
-from .hud_overlay import HUDOverlay, HUDManager, PlayerHUDWidget
-from .main_window import MainWindow
+from importlib import import_module
+
+# Sous-module de chaque nom exporté : importé au premier accès seulement,
+# pour ne pas charger le HUD au démarrage de la fenêtre principale
+_EXPORTS = {
+    "HUDOverlay": ".hud_overlay",
+    "HUDManager": ".hud_overlay",
+    "PlayerHUDWidget": ".hud_overlay",
+    "MainWindow": ".main_window",
+}
 
 __all__ = ["HUDOverlay", "HUDManager", "PlayerHUDWidget", "MainWindow"]
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,6 @@
 """HUD Overlay pour afficher les stats des joueurs."""
 
+import math
 import sys
 
 from PyQt6.QtWidgets import (
@@ -119,11 +120,12 @@ class PlayerHUDWidget(QFrame):
         if not self._stats:
             return
         s = self._stats
+        af = s.af
         labels = {st[0]: st[1].replace("%", "") for st in HUD_STATS}
         values = {
             "vpip": f"{s.vpip:.0f}" if s.vpip < 100 else "99+",
             "pfr": f"{s.pfr:.0f}" if s.pfr < 100 else "99+",
-            "af": f"{s.af:.1f}" if s.af != float('inf') else "inf",
+            "af": "inf" if math.isinf(af) else f"{af:.1f}",
             "three_bet": f"{s.three_bet:.0f}" if s.three_bet_opportunities > 0 else "-",
             "cbet": f"{s.cbet:.0f}" if s.cbet_opportunities > 0 else "-",
             "fold_to_3bet": f"{s.fold_to_3bet:.0f}" if s.fold_to_3bet_opportunities > 0 else "-",
@@ -1,56 +1,64 @@
 """Fenêtre principale de l'application."""
 
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable
 
 
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLabel, QFileDialog, QTableWidget,
-    QTableWidgetItem, QHeaderView, QGroupBox, QStatusBar,
+    QPushButton, QLabel, QFileDialog, QTableView,
+    QHeaderView, QGroupBox, QStatusBar, QCheckBox,
     QMessageBox, QProgressDialog
 )
-from PyQt6.QtCore import Qt, QSettings, QThread, QMetaObject
+from PyQt6.QtCore import Qt, QSettings, QThread, QThreadPool, QRunnable, QMetaObject, QTimer, Q_ARG
 from PyQt6.QtGui import QAction
 
 
-class NumericTableWidgetItem(QTableWidgetItem):
-    """Item de tableau avec tri numérique correct."""
+class _WatcherRunnable(QRunnable):
+    """Exécute une méthode de LogWatcher dans le pool de threads Qt."""
 
-    def __init__(self, text: str, value: float):
-        super().__init__(text)
-        self._value = value
+    def __init__(self, target: Callable[[], None]):
+        super().__init__()
+        self._target = target
+
+    def run(self) -> None:
+        self._target()
 
-    def __lt__(self, other: QTableWidgetItem) -> bool:
-        if isinstance(other, NumericTableWidgetItem):
-            return self._value < other._value
-        return super().__lt__(other)
 
 from ..database.log_parser import LogParser
 from ..database.stats_db import StatsDB
 from ..database.models import PlayerStats
-from ..watcher.log_watcher import LogWatcher
-from .hud_overlay import HUDManager
-from .hud_settings import HUDSettingsDialog
-from .range_window import RangeWindow
+from ..watcher.log_watcher import LogWatcher, list_log_files
+from .stats_model import PlayerStatsModel, TablePlayersFilterModel, STATS_HEADERS, NUMERIC_COLUMNS
 from config import POKERTH_LOG_DIR, STATS_DB_PATH
 
+if TYPE_CHECKING:
+    # Importés à la demande : le HUD et la fenêtre de range ne servent qu'après une action utilisateur
+    from .hud_overlay import HUDManager
+    from .range_window import RangeWindow
+
 
 class MainWindow(QMainWindow):
     """Fenêtre principale du PokerTH Tracker."""
 
+    # Délai de regroupement des mises à jour live (imperceptible pour l'utilisateur)
+    _STATS_REFRESH_DELAY_MS = 200
+
     def __init__(self):
         super().__init__()
         self.settings = QSettings("PokerTHTracker", "PTHTracker")
         self.stats_db = StatsDB(STATS_DB_PATH)
         self._watcher_thread: QThread | None = None
         self.log_watcher: LogWatcher | None = None
-        self.hud: HUDManager | None = None
-        self.range_window: RangeWindow | None = None
+        self.hud: "HUDManager | None" = None
+        self.range_window: "RangeWindow | None" = None
         self.is_tracking = False
-        # Flag pour savoir si le HUD attend des stats
-        self._hud_waiting_for_stats = False
-        # Thread et watcher temporaires pour l'import
-        self._import_thread: QThread | None = None
+        # Jetons des demandes de stats destinées au HUD, en attente de réponse
+        self._pending_hud_tokens: set[int] = set()
+        self._next_hud_token = 0
+        # Pool de threads Qt pour les tâches ponctuelles (import)
+        self._pool = QThreadPool.globalInstance()
+        # Watcher temporaire pour l'import (None quand aucun import ne tourne)
         self._import_watcher: LogWatcher | None = None
         self._import_result_count: int = 0
         self._import_error_msg: str | None = None
@@ -58,7 +66,14 @@ class MainWindow(QMainWindow):
         self._closing: bool = False
         # Cache des stats et joueurs de la table pour le filtrage
         self._all_stats: dict[str, PlayerStats] = {}
-        self._table_players: list[str] = []
+        # Ensemble (et non liste) : sert uniquement à des tests d'appartenance
+        self._table_players: frozenset[str] = frozenset()
+        # Regroupe les stats_updated rapprochés (une action de jeu = un signal)
+        self._pending_stats: dict[str, PlayerStats] = {}
+        self._stats_refresh_timer = QTimer(self)
+        self._stats_refresh_timer.setSingleShot(True)
+        self._stats_refresh_timer.setInterval(self._STATS_REFRESH_DELAY_MS)
+        self._stats_refresh_timer.timeout.connect(self._apply_pending_stats)
 
         self._setup_window()
         self._setup_ui()
@@ -110,35 +125,44 @@ class MainWindow(QMainWindow):
         self.show_range_btn.setMinimumHeight(40)
         controls_layout.addWidget(self.show_range_btn)
 
-        self.refresh_btn = QPushButton("Import")
-        self.refresh_btn.clicked.connect(self._show_import_menu)
-        self.refresh_btn.setMinimumHeight(40)
-        controls_layout.addWidget(self.refresh_btn)
-
         layout.addLayout(controls_layout)
 
         # Section stats
         stats_group = QGroupBox("Player statistics")
         stats_layout = QVBoxLayout(stats_group)
 
-        self.stats_table = QTableWidget()
-        self.stats_table.setColumnCount(11)
-        self.stats_table.setHorizontalHeaderLabels([
-            "Player", "VPIP%", "PFR%", "AF", "3-Bet%", "C-Bet%",
-            "F3B%", "FCB%", "WTSD%", "W$SD%", "Hands"
-        ])
-        self.stats_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        for i in range(1, 11):
-            self.stats_table.horizontalHeader().setSectionResizeMode(
-                i, QHeaderView.ResizeMode.ResizeToContents
-            )
+        # Modèle des stats (trié par lui-même) : la vue ne crée rien par
+        # cellule et ne formate que les lignes visibles
+        self.stats_model = PlayerStatsModel(self)
+        self.stats_proxy = TablePlayersFilterModel(self)
+        self.stats_proxy.setSourceModel(self.stats_model)
+
+        self.table_only_checkbox = QCheckBox("Current table only")
+        self.table_only_checkbox.toggled.connect(self._on_filter_changed)
+        stats_layout.addWidget(self.table_only_checkbox)
+
+        self.stats_table = QTableView()
+        self.stats_table.setModel(self.stats_proxy)
+        header = self.stats_table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        # Largeur fixe calculée une fois : ResizeToContents mesurerait toutes
+        # les cellules à chaque rafraîchissement
+        fm = header.fontMetrics()
+        numeric_width = max(fm.horizontalAdvance(text) for text in STATS_HEADERS[1:] + ("100.0",)) + 24
+        for i in NUMERIC_COLUMNS:
+            header.setSectionResizeMode(i, QHeaderView.ResizeMode.Interactive)
+            header.resizeSection(i, numeric_width)
         self.stats_table.setAlternatingRowColors(True)
-        self.stats_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        # Active le tri par clic sur les en-têtes
+        self.stats_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        # Aucun tri actif au départ : la base renvoie déjà les joueurs par nombre
+        # de mains décroissant, et le modèle ne re-trie qu'après un clic sur un
+        # en-tête. L'indicateur doit être retiré avant setSortingEnabled(), qui
+        # trie immédiatement sur la colonne indiquée.
+        header.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
         self.stats_table.setSortingEnabled(True)
-        # Tri par défaut: nombre de mains décroissant
-        self.stats_table.sortByColumn(10, Qt.SortOrder.DescendingOrder)
-        self.stats_table.itemSelectionChanged.connect(self._on_player_selected)
+        self.stats_table.selectionModel().selectionChanged.connect(self._on_player_selected)
+        # Un reset du modèle vide la sélection sans émettre selectionChanged
+        self.stats_model.modelReset.connect(self._on_player_selected)
         stats_layout.addWidget(self.stats_table)
 
         layout.addWidget(stats_group)
@@ -196,6 +220,12 @@ class MainWindow(QMainWindow):
         self._all_stats = self.stats_db.get_all_players_stats()
         self._update_stats_table(self._all_stats)
 
+        # Restaure largeurs et tri des colonnes ; le tri n'est appliqué que si
+        # l'utilisateur en avait choisi un (sinon l'ordre de la base est conservé)
+        header_state = self.settings.value("stats_header_state")
+        if header_state:
+            self.stats_table.horizontalHeader().restoreState(header_state)
+
     def _save_settings(self) -> None:
         """Sauvegarde les paramètres."""
         self.settings.setValue("log_dir", str(self.log_dir))
@@ -230,8 +260,8 @@ class MainWindow(QMainWindow):
             return
 
         # Vérifie que le dernier log contient des actions
-        pdb_files = list(self.log_dir.glob("pokerth-log-*.pdb"))
-        if not pdb_files:
+        _, latest = list_log_files(self.log_dir)
+        if latest is None:
             QMessageBox.warning(
                 self,
                 "Error",
@@ -239,7 +269,6 @@ class MainWindow(QMainWindow):
             )
             return
 
-        latest = max(pdb_files, key=lambda p: p.stat().st_mtime)
         try:
             parser = LogParser(latest)
             has_data = parser.has_actions()
@@ -272,6 +301,7 @@ class MainWindow(QMainWindow):
 
         # Connecte les nouveaux signaux pour les appels asynchrones
         self.log_watcher.table_stats_ready.connect(self._on_table_stats_ready)
+        self.log_watcher.table_stats_ready_token.connect(self._on_hud_stats_ready)
 
         # Démarre le watcher quand le thread démarre
         self._watcher_thread.started.connect(self.log_watcher.start)
@@ -283,7 +313,6 @@ class MainWindow(QMainWindow):
         self.start_btn.setText("Stop tracking")
         # Le bouton HUD reste grisé jusqu'à ce qu'il y ait des stats
         self.show_hud_btn.setEnabled(False)
-        self.refresh_btn.setEnabled(False)
         self.import_action.setEnabled(False)
         self.status_bar.showMessage("Tracking active - waiting for data...")
 
@@ -302,12 +331,17 @@ class MainWindow(QMainWindow):
         self.start_btn.setEnabled(False)
 
         thread.finished.connect(lambda: self._on_tracking_finished(watcher, thread))
+        # Le thread ne quitte qu'une fois stop() exécuté dans sa boucle d'événements
+        watcher.finished.connect(thread.quit)
         QMetaObject.invokeMethod(watcher, "stop", Qt.ConnectionType.QueuedConnection)
-        thread.quit()
 
     def _on_tracking_finished(self, watcher, thread) -> None:
         """Appelé quand le thread de tracking s'est arrêté."""
-        watcher.save_pending_stats()
+        saved_stats = watcher.save_pending_stats()
+        self._pending_hud_tokens.clear()
+        # Les totaux sauvegardés remplacent les mises à jour live pas encore appliquées
+        self._stats_refresh_timer.stop()
+        self._pending_stats = {}
         watcher.deleteLater()
         thread.deleteLater()
 
@@ -319,25 +353,25 @@ class MainWindow(QMainWindow):
         self.start_btn.setEnabled(True)
         self.show_hud_btn.setEnabled(False)
         self.show_hud_btn.setText("Show HUD")
-        self.refresh_btn.setEnabled(True)
         self.import_action.setEnabled(True)
 
         if self.hud:
             self.hud.hide()
 
-        self._all_stats = self.stats_db.get_all_players_stats()
-        self._refresh_table_display()
+        # Seuls les joueurs du fichier courant ont changé en base : inutile de
+        # relire toute la table, les totaux fusionnés suffisent
+        self._update_changed_rows(saved_stats)
+        self._all_stats.update(saved_stats)
         self.status_bar.showMessage("Tracking stopped")
 
     def _toggle_hud(self) -> None:
         """Affiche/masque le HUD."""
         if self.hud is None:
+            from .hud_overlay import HUDManager
             self.hud = HUDManager(on_reset_callback=self._on_hud_reset)
 
             # Demande les stats de manière asynchrone
-            if self.log_watcher:
-                self._hud_waiting_for_stats = True
-                self.log_watcher.request_table_stats()
+            self._request_hud_stats()
 
             self.hud.show()
             self.show_hud_btn.setText("Hide HUD")
@@ -347,36 +381,39 @@ class MainWindow(QMainWindow):
                 self.show_hud_btn.setText("Show HUD")
             else:
                 # Demande des stats fraîches avant de réafficher le HUD
-                if self.log_watcher:
-                    self._hud_waiting_for_stats = True
-                    self.log_watcher.request_table_stats()
+                self._request_hud_stats()
                 self.hud.show()
                 self.show_hud_btn.setText("Hide HUD")
 
-    def _show_import_menu(self) -> None:
-        self._import_all_logs()
-
     def _on_stats_updated(self, stats: dict[str, PlayerStats]) -> None:
-        """Appelé quand les stats sont mises à jour."""
-        # Cache les stats
-        self._all_stats = stats
+        """Appelé quand les stats sont mises à jour.
+
+        Les mises à jour sont accumulées et appliquées au plus une fois par
+        _STATS_REFRESH_DELAY_MS par _apply_pending_stats.
+        """
+        self._pending_stats.update(stats)
+        if not self._stats_refresh_timer.isActive():
+            self._stats_refresh_timer.start()
+
+    def _apply_pending_stats(self) -> None:
+        """Applique les stats accumulées au tableau et rafraîchit le HUD."""
+        stats, self._pending_stats = self._pending_stats, {}
+        if not stats:
+            return
 
-        # Met à jour la table avec le filtre actuel
-        self._refresh_table_display()
+        # Ne réécrit que les lignes modifiées, puis met à jour le cache
+        self._update_changed_rows(stats)
+        self._all_stats.update(stats)
 
-        # Demande les stats de la table de manière asynchrone
+        # Demande les stats de la table de manière asynchrone : l'appel est mis
+        # en file pour le thread du watcher (un appel direct ferait le SQL ici)
         if self.is_tracking and self.log_watcher:
-            self.log_watcher.request_table_stats()
+            QMetaObject.invokeMethod(
+                self.log_watcher, "request_table_stats", Qt.ConnectionType.QueuedConnection
+            )
 
     def _on_table_stats_ready(self, table_stats: dict[str, PlayerStats]) -> None:
         """Appelé quand les stats de la table sont prêtes (appel asynchrone)."""
-        # Gère le flag d'attente du HUD
-        if self._hud_waiting_for_stats:
-            self._hud_waiting_for_stats = False
-            if self.hud:
-                self.hud.update_stats(table_stats)
-            return
-
         # Active le bouton HUD quand il y a des stats de table exploitables
         if self.is_tracking:
             has_data = any(s.total_hands > 0 for s in table_stats.values())
@@ -388,88 +425,50 @@ class MainWindow(QMainWindow):
             if self.hud and self.hud.is_visible():
                 self.hud.update_stats(table_stats)
 
+    def _request_hud_stats(self) -> None:
+        """Demande les stats de la table pour le HUD (réponse via _on_hud_stats_ready)."""
+        if not self.log_watcher:
+            return
+        self._next_hud_token += 1
+        token = self._next_hud_token
+        self._pending_hud_tokens.add(token)
+        QMetaObject.invokeMethod(
+            self.log_watcher, "request_table_stats_for",
+            Qt.ConnectionType.QueuedConnection, Q_ARG(int, token),
+        )
+
+    def _on_hud_stats_ready(self, token: int, table_stats: dict[str, PlayerStats]) -> None:
+        """Appelé avec la réponse à une demande de _request_hud_stats."""
+        if token not in self._pending_hud_tokens:
+            return
+        self._pending_hud_tokens.remove(token)
+        if self.hud:
+            self.hud.update_stats(table_stats)
+
     def _on_new_log(self, log_path: str) -> None:
         """Appelé quand un nouveau fichier de log est détecté."""
         self.status_bar.showMessage(f"Nouveau log: {Path(log_path).name}")
 
     def _on_table_changed(self, players: list[str]) -> None:
         """Appelé quand les joueurs de la table changent."""
-        self._table_players = players
+        self._table_players = frozenset(players)
+        self.stats_proxy.set_players(self._table_players)
         self.status_bar.showMessage(f"Table: {len(players)} players")
 
     def _on_hud_reset(self) -> None:
         """Appelé quand le HUD est réinitialisé (reset positions)."""
-        if self.log_watcher:
-            self._hud_waiting_for_stats = True
-            self.log_watcher.request_table_stats()
-
-    def _refresh_table_display(self) -> None:
-        """Rafraîchit l'affichage de la table."""
-        self._update_stats_table(self._all_stats)
+        self._request_hud_stats()
 
     def _update_stats_table(self, stats: dict[str, PlayerStats]) -> None:
-        """Met à jour le tableau des stats."""
-        # Désactive les mises à jour visuelles et les signaux pendant le remplissage
-        self.stats_table.setUpdatesEnabled(False)
-        self.stats_table.blockSignals(True)
-        self.stats_table.setSortingEnabled(False)
-        self.stats_table.setRowCount(len(stats))
-
-        for row, (name, player_stats) in enumerate(stats.items()):
-            # Colonne 0: Nom du joueur (texte)
-            self.stats_table.setItem(row, 0, QTableWidgetItem(name))
-
-            # Colonne 1: VPIP%
-            vpip_val = player_stats.vpip
-            self.stats_table.setItem(row, 1, NumericTableWidgetItem(f"{vpip_val:.1f}", vpip_val))
-
-            # Colonne 2: PFR%
-            pfr_val = player_stats.pfr
-            self.stats_table.setItem(row, 2, NumericTableWidgetItem(f"{pfr_val:.1f}", pfr_val))
-
-            # Colonne 3: AF
-            af_val = player_stats.af if player_stats.af != float('inf') else 9999
-            af_text = f"{player_stats.af:.1f}" if player_stats.af != float('inf') else "inf"
-            self.stats_table.setItem(row, 3, NumericTableWidgetItem(af_text, af_val))
-
-            # Colonne 4: 3-Bet%
-            three_bet_val = player_stats.three_bet if player_stats.three_bet_opportunities > 0 else -1
-            three_bet_text = f"{player_stats.three_bet:.1f}" if player_stats.three_bet_opportunities > 0 else "-"
-            self.stats_table.setItem(row, 4, NumericTableWidgetItem(three_bet_text, three_bet_val))
-
-            # Colonne 5: C-Bet%
-            cbet_val = player_stats.cbet if player_stats.cbet_opportunities > 0 else -1
-            cbet_text = f"{player_stats.cbet:.1f}" if player_stats.cbet_opportunities > 0 else "-"
-            self.stats_table.setItem(row, 5, NumericTableWidgetItem(cbet_text, cbet_val))
-
-            # Colonne 6: Fold to 3-Bet%
-            f3b_val = player_stats.fold_to_3bet if player_stats.fold_to_3bet_opportunities > 0 else -1
-            f3b_text = f"{player_stats.fold_to_3bet:.1f}" if player_stats.fold_to_3bet_opportunities > 0 else "-"
-            self.stats_table.setItem(row, 6, NumericTableWidgetItem(f3b_text, f3b_val))
-
-            # Colonne 7: Fold to C-Bet%
-            fcb_val = player_stats.fold_to_cbet if player_stats.fold_to_cbet_opportunities > 0 else -1
-            fcb_text = f"{player_stats.fold_to_cbet:.1f}" if player_stats.fold_to_cbet_opportunities > 0 else "-"
-            self.stats_table.setItem(row, 7, NumericTableWidgetItem(fcb_text, fcb_val))
-
-            # Colonne 8: WTSD%
-            wtsd_val = player_stats.wtsd if player_stats.hands_saw_flop > 0 else -1
-            wtsd_text = f"{player_stats.wtsd:.1f}" if player_stats.hands_saw_flop > 0 else "-"
-            self.stats_table.setItem(row, 8, NumericTableWidgetItem(wtsd_text, wtsd_val))
-
-            # Colonne 9: W$SD%
-            wsd_val = player_stats.wsd if player_stats.hands_went_to_showdown > 0 else -1
-            wsd_text = f"{player_stats.wsd:.1f}" if player_stats.hands_went_to_showdown > 0 else "-"
-            self.stats_table.setItem(row, 9, NumericTableWidgetItem(wsd_text, wsd_val))
-
-            # Colonne 10: Nombre de mains
-            hands_val = player_stats.total_hands
-            self.stats_table.setItem(row, 10, NumericTableWidgetItem(str(hands_val), hands_val))
-
-        # Réactive le tri et les mises à jour visuelles
-        self.stats_table.setSortingEnabled(True)
-        self.stats_table.blockSignals(False)
-        self.stats_table.setUpdatesEnabled(True)
+        """Remplace tout le contenu du tableau des stats."""
+        self.stats_model.set_stats(stats)
+
+    def _update_changed_rows(self, stats: dict[str, PlayerStats]) -> None:
+        """Met à jour uniquement les lignes des joueurs dont les stats ont changé.
+
+        Les nouveaux joueurs sont ajoutés au modèle, qui les place selon le tri courant.
+        """
+        self.stats_model.update_stats(stats)
 
     def _clear_stats(self) -> None:
         """Efface toutes les stats."""
@@ -482,18 +481,20 @@ class MainWindow(QMainWindow):
 
         if reply == QMessageBox.StandardButton.Yes:
             self.stats_db.clear_all_stats()
-            self.stats_table.setRowCount(0)
+            self._pending_stats = {}
+            self._all_stats = {}
+            self._update_stats_table(self._all_stats)
             if self.hud:
                 self.hud.clear()
             self.status_bar.showMessage("Stats cleared")
 
     def _import_all_logs(self) -> None:
         """Importe de façon incrémentale les fichiers .pdb du dossier de logs."""
-        if self._import_thread is not None:
+        if self._import_watcher is not None:
             QMessageBox.warning(self, "Import", "An import is already in progress.")
             return
 
-        pdb_files = sorted(self.log_dir.glob("pokerth-log-*.pdb"))
+        pdb_files, _ = list_log_files(self.log_dir)
         if not pdb_files:
             QMessageBox.information(self, "Import", f"No log files found in:\n{self.log_dir}")
             return
@@ -508,17 +509,15 @@ class MainWindow(QMainWindow):
         if reply != QMessageBox.StandardButton.Yes:
             return
 
-        self._import_thread = QThread(self)
+        # Le watcher reste dans le thread UI : ses signaux émis depuis le pool
+        # arrivent donc en connexion « queued »
         self._import_watcher = LogWatcher(self.log_dir, self.stats_db)
-        self._import_watcher.moveToThread(self._import_thread)
 
         self._import_watcher.import_progress.connect(self._on_import_progress)
         self._import_watcher.import_loading_stats.connect(self._on_import_loading_stats)
         self._import_watcher.import_finished.connect(self._on_import_finished)
         self._import_watcher.import_error.connect(self._on_import_error)
 
-        self._import_thread.started.connect(self._import_watcher.request_import_all_logs)
-
         self._import_result_count = 0
         self._import_error_msg = None
 
@@ -534,15 +533,15 @@ class MainWindow(QMainWindow):
         self._import_progress.setAutoReset(False)
         self._import_progress.canceled.connect(self._on_import_canceled)
 
-        self._import_thread.start()
+        self._pool.start(_WatcherRunnable(self._import_watcher.request_import_all_logs))
 
         # Bloque ici en exécutant une boucle d'événements propre.
         # Les signaux du thread worker sont traités dans cette boucle.
         result = self._import_progress.exec()
 
-        # exec() est retourné — nettoyage
+        # exec() est retourné. Le watcher est libéré par _on_import_finished /
+        # _on_import_error, une fois le travail du pool réellement terminé.
         self._import_progress = None
-        self._cleanup_thread()
 
         if result == QProgressDialog.DialogCode.Accepted:
             QMessageBox.information(
@@ -552,7 +551,9 @@ class MainWindow(QMainWindow):
                 f"{len(self._all_stats)} players in database."
             )
             if self._import_result_count > 0:
-                self._refresh_table_display()
+                # L'import ne supprime aucun joueur : mise à jour incrémentale
+                # plutôt que reset du modèle (sélection et défilement conservés)
+                self._update_changed_rows(self._all_stats)
             self.status_bar.showMessage(f"Import completed: {self._import_result_count} files")
         elif self._import_error_msg:
             QMessageBox.warning(self, "Error", f"Error during import:\n{self._import_error_msg}")
@@ -562,7 +563,8 @@ class MainWindow(QMainWindow):
     def _on_import_progress(self, current: int, total: int, filename: str) -> None:
         """Appelé lors de la progression de l'import."""
         if self._import_progress:
-            self._import_progress.setMaximum(total)
+            if self._import_progress.maximum() != total:
+                self._import_progress.setMaximum(total)
             self._import_progress.setValue(current)
             self._import_progress.setLabelText(f"Import: {filename}")
 
@@ -576,63 +578,59 @@ class MainWindow(QMainWindow):
         if stats:  # vide si imported == 0 (stats inchangées)
             self._all_stats = stats
         self._import_result_count = imported
+        self._release_import_watcher()
         if self._import_progress:
             self._import_progress.canceled.disconnect(self._on_import_canceled)
             self._import_progress.accept()
+        elif stats:
+            # Import annulé : les fichiers déjà traités sont en base, on les affiche
+            self._update_changed_rows(stats)
+            self.status_bar.showMessage(f"Import canceled: {imported} files imported")
 
     def _on_import_error(self, error: str) -> None:
         """Appelé en cas d'erreur lors de l'import."""
         self._import_error_msg = error
+        self._release_import_watcher()
         if self._import_progress:
             self._import_progress.canceled.disconnect(self._on_import_canceled)
             self._import_progress.reject()
 
     def _on_import_canceled(self) -> None:
         """Appelé quand l'utilisateur annule l'import."""
+        # Interrompt le travail du pool au prochain fichier (la base reste cohérente)
+        if self._import_watcher:
+            self._import_watcher.cancel()
         if self._import_progress:
             self._import_progress.canceled.disconnect(self._on_import_canceled)
             self._import_progress.reject()
 
-    def _cleanup_thread(self) -> None:
-        """Arrête et libère le thread d'import sans bloquer le thread UI."""
-        if self._import_thread:
-            thread = self._import_thread
-            watcher = self._import_watcher
-            self._import_thread = None
+    def _release_import_watcher(self) -> None:
+        """Libère le watcher d'import une fois sa tâche terminée dans le pool."""
+        if self._import_watcher:
+            self._import_watcher.deleteLater()
             self._import_watcher = None
-            if watcher:
-                watcher.deleteLater()
-            thread.quit()
-            thread.finished.connect(thread.deleteLater)
 
     def _open_hud_settings(self) -> None:
         """Ouvre la fenêtre de configuration du HUD."""
+        from .hud_settings import HUDSettingsDialog
         dialog = HUDSettingsDialog(self)
         if dialog.exec() and self.hud:
             # Rafraîchit le HUD avec les nouveaux paramètres
             self.hud.reload_settings()
             # Demande les stats de manière asynchrone
-            if self.log_watcher:
-                self.log_watcher.request_table_stats()
+            self._request_hud_stats()
 
     def closeEvent(self, event) -> None:
         """Arrête proprement les threads avant de quitter."""
         if self.range_window is not None:
             self.range_window.close()
+        self.settings.setValue("stats_header_state", self.stats_table.horizontalHeader().saveState())
         if self.is_tracking:
             # Arrêt async : on reporte la fermeture jusqu'à la fin du thread
             event.ignore()
             self._closing = True
             self._stop_tracking()
             return
-        if self._import_thread is not None:
-            thread = self._import_thread
-            self._import_thread = None
-            if self._import_watcher:
-                self._import_watcher.deleteLater()
-            self._import_watcher = None
-            thread.quit()
-            thread.finished.connect(thread.deleteLater)
         super().closeEvent(event)
 
     def _show_about(self) -> None:
@@ -653,16 +651,25 @@ class MainWindow(QMainWindow):
         self.range_window = None
         self.show_range_btn.setText("Show Range")
 
+    def _selected_player(self) -> str | None:
+        """Retourne le nom du joueur de la ligne courante du tableau (None si aucune)."""
+        index = self.stats_table.currentIndex()
+        if not index.isValid():
+            return None
+        return self.stats_model.player_name(self.stats_proxy.mapToSource(index).row())
+
+    def _on_filter_changed(self, checked: bool) -> None:
+        """Affiche uniquement les joueurs de la table actuelle (ou tous)."""
+        self.stats_proxy.set_enabled(checked)
+
     def _on_player_selected(self) -> None:
         """Active le bouton Range quand un joueur est sélectionné, et met à jour la range si visible."""
-        row = self.stats_table.currentRow()
-        name_item = self.stats_table.item(row, 0) if row >= 0 else None
-        self.show_range_btn.setEnabled(name_item is not None)
+        player_name = self._selected_player()
+        self.show_range_btn.setEnabled(player_name is not None)
 
-        if name_item is None or self.range_window is None or not self.range_window.isVisible():
+        if player_name is None or self.range_window is None or not self.range_window.isVisible():
             return
 
-        player_name = name_item.text()
         self.range_window.update_data(player_name, self.stats_db.get_player_combos(player_name))
 
     def _toggle_range(self) -> None:
@@ -672,16 +679,13 @@ class MainWindow(QMainWindow):
             self.show_range_btn.setText("Show Range")
             return
 
-        row = self.stats_table.currentRow()
-        if row < 0:
-            return
-        name_item = self.stats_table.item(row, 0)
-        if name_item is None:
+        player_name = self._selected_player()
+        if player_name is None:
             return
-        player_name = name_item.text()
 
         if self.range_window is None:
+            from .range_window import RangeWindow
             self.range_window = RangeWindow()
             self.range_window.closed.connect(self._on_range_window_closed)
         self.range_window.update_data(player_name, self.stats_db.get_player_combos(player_name))
-        self.show_range_btn.setText("Hide Range")
\ No newline at end of file
+        self.show_range_btn.setText("Hide Range")
@@ -0,0 +1,229 @@
+"""Modèle Qt du tableau des stats joueurs."""
+
+import math
+from functools import lru_cache
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+
+from ..database.models import PlayerStats
+
+
+# En-têtes du tableau des stats : colonne 0 = nom, colonnes 1 à 10 = _stats_row_values()
+STATS_HEADERS = (
+    "Player", "VPIP%", "PFR%", "AF", "3-Bet%", "C-Bet%",
+    "F3B%", "FCB%", "WTSD%", "W$SD%", "Hands",
+)
+NUMERIC_COLUMNS = range(1, len(STATS_HEADERS))
+HANDS_COLUMN = len(STATS_HEADERS) - 1
+
+# Rôle portant la valeur brute d'une cellule
+SORT_ROLE = Qt.ItemDataRole.UserRole
+
+# Résolus une fois : évite la recherche d'attribut d'enum à chaque appel de data()
+_DISPLAY_ROLE = Qt.ItemDataRole.DisplayRole
+_HORIZONTAL = Qt.Orientation.Horizontal
+_DESCENDING = Qt.SortOrder.DescendingOrder
+
+
+@lru_cache(maxsize=8192)
+def _format_stat(value: float) -> str:
+    """Formate une valeur de stat pour l'affichage.
+
+    Les pourcentages sont des ratios de petits entiers et reviennent sans
+    cesse à chaque repaint : le cache renvoie la même chaîne au lieu d'en
+    allouer une nouvelle.
+    """
+    if value < 0:
+        return "-"  # Aucune opportunité
+    if math.isinf(value):
+        return "inf"
+    return f"{value:.1f}"
+
+
+def _stats_row_values(player_stats: PlayerStats) -> tuple[float, ...]:
+    """Retourne les valeurs des colonnes 1 à 10 d'un joueur (-1.0 si aucune opportunité).
+
+    Un seul tuple construit par ligne : moins coûteux qu'un appel de fonction par colonne.
+    """
+    return (
+        player_stats.vpip,
+        player_stats.pfr,
+        player_stats.af,
+        player_stats.three_bet if player_stats.three_bet_opportunities > 0 else -1.0,
+        player_stats.cbet if player_stats.cbet_opportunities > 0 else -1.0,
+        player_stats.fold_to_3bet if player_stats.fold_to_3bet_opportunities > 0 else -1.0,
+        player_stats.fold_to_cbet if player_stats.fold_to_cbet_opportunities > 0 else -1.0,
+        player_stats.wtsd if player_stats.hands_saw_flop > 0 else -1.0,
+        player_stats.wsd if player_stats.hands_went_to_showdown > 0 else -1.0,
+        player_stats.total_hands,
+    )
+
+
+class PlayerStatsModel(QAbstractTableModel):
+    """Stats des joueurs, une ligne par joueur.
+
+    Seules les valeurs brutes sont stockées ; le texte est formaté à la
+    demande par data(), donc uniquement pour les cellules visibles.
+
+    Le tri est fait par le modèle lui-même sur ces valeurs (clés calculées
+    une fois par ligne), sans appel à data() par comparaison comme le ferait
+    un QSortFilterProxyModel.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._names: list[str] = []
+        self._values: list[tuple[float, ...]] = []
+        # Ligne de chaque joueur, pour les mises à jour incrémentales
+        self._rows: dict[str, int] = {}
+        # Tri courant (-1 : aucun), réappliqué après chaque mise à jour
+        self._sort_column = -1
+        self._sort_order = Qt.SortOrder.AscendingOrder
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._names)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(STATS_HEADERS)
+
+    def data(self, index: QModelIndex, role: int = _DISPLAY_ROLE):
+        col = index.column()
+        if role == _DISPLAY_ROLE:
+            if col == 0:
+                return self._names[index.row()]
+            value = self._values[index.row()][col - 1]
+            if col == HANDS_COLUMN:
+                return str(value)
+            return _format_stat(value)
+        if role == SORT_ROLE:
+            if col == 0:
+                return self._names[index.row()]
+            return self._values[index.row()][col - 1]
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = _DISPLAY_ROLE):
+        if role == _DISPLAY_ROLE and orientation == _HORIZONTAL:
+            return STATS_HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def player_name(self, row: int) -> str:
+        """Retourne le nom du joueur de la ligne."""
+        return self._names[row]
+
+    def set_stats(self, stats: dict[str, PlayerStats]) -> None:
+        """Remplace tout le contenu du modèle."""
+        self.beginResetModel()
+        self._names = list(stats)
+        # Seules les valeurs brutes sont calculées ici ; aucun formatage au chargement
+        self._values = list(map(_stats_row_values, stats.values()))
+        self._rows = {name: row for row, name in enumerate(self._names)}
+        self._sort_rows()
+        self.endResetModel()
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        """Trie les lignes (appelé par la vue lors d'un clic sur un en-tête)."""
+        self._sort_column = column
+        self._sort_order = order
+        self.layoutAboutToBeChanged.emit()
+        moved = self._sort_rows()
+        if moved is not None:
+            # Les index persistants (sélection, ligne courante) suivent leur joueur
+            old_indexes = self.persistentIndexList()
+            new_indexes = [self.index(moved[index.row()], index.column()) for index in old_indexes]
+            self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+    def _sort_rows(self) -> list[int] | None:
+        """Réordonne les lignes selon le tri courant.
+
+        Returns:
+            Nouvelle position de chaque ancienne ligne, ou None si l'ordre est inchangé
+        """
+        column = self._sort_column
+        if column < 0 or column >= len(STATS_HEADERS):
+            return None
+        if column == 0:
+            keys = self._names
+        else:
+            keys = [values[column - 1] for values in self._values]
+        order = sorted(range(len(keys)), key=keys.__getitem__, reverse=self._sort_order == _DESCENDING)
+        if all(old == new for new, old in enumerate(order)):
+            return None
+
+        self._names = [self._names[old] for old in order]
+        self._values = [self._values[old] for old in order]
+        self._rows = {name: row for row, name in enumerate(self._names)}
+        moved = [0] * len(order)
+        for new, old in enumerate(order):
+            moved[old] = new
+        return moved
+
+    def update_stats(self, stats: dict[str, PlayerStats]) -> None:
+        """Met à jour les joueurs donnés ; les nouveaux sont ajoutés en fin de modèle.
+
+        dataChanged n'est émis que pour les lignes dont les valeurs affichées
+        ont changé, sur la plage de colonnes concernée.
+        """
+        new_rows: list[tuple[str, tuple[float, ...]]] = []
+        resort = False
+        for name, player_stats in stats.items():
+            values = _stats_row_values(player_stats)
+            row = self._rows.get(name)
+            if row is None:
+                new_rows.append((name, values))
+                continue
+
+            old_values = self._values[row]
+            if old_values == values:
+                continue
+            self._values[row] = values
+            changed = [col for col, (old, new) in enumerate(zip(old_values, values), 1) if old != new]
+            self.dataChanged.emit(self.index(row, changed[0]), self.index(row, changed[-1]))
+            resort = resort or self._sort_column in changed
+
+        if new_rows:
+            first = len(self._names)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+            for name, values in new_rows:
+                self._rows[name] = len(self._names)
+                self._names.append(name)
+                self._values.append(values)
+            self.endInsertRows()
+            resort = True
+
+        if resort:
+            self.sort(self._sort_column, self._sort_order)
+
+
+class TablePlayersFilterModel(QSortFilterProxyModel):
+    """Filtre optionnel sur les joueurs de la table actuelle.
+
+    Activer/désactiver le filtre ou changer de table ne fait que réévaluer
+    filterAcceptsRow() : le modèle source n'est jamais reconstruit.
+    Le tri reste celui de PlayerStatsModel, auquel sort() est délégué.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._enabled = False
+        self._players: frozenset[str] = frozenset()
+
+    def set_enabled(self, enabled: bool) -> None:
+        """Active ou désactive le filtre."""
+        if enabled != self._enabled:
+            self._enabled = enabled
+            self.invalidateFilter()
+
+    def set_players(self, players: frozenset[str]) -> None:
+        """Définit les joueurs de la table actuelle."""
+        if players != self._players:
+            self._players = players
+            if self._enabled:
+                self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        return not self._enabled or self.sourceModel().player_name(source_row) in self._players
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        """Délègue le tri au modèle source (le proxy conserve son ordre)."""
+        self.sourceModel().sort(column, order)
@@ -1,9 +1,13 @@
 """Surveillance des fichiers de log PokerTH en temps réel."""
 
 import json
+import logging
+import multiprocessing
 import os
 import sqlite3
-from dataclasses import asdict, fields as dataclass_fields
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import Callable
 
@@ -12,7 +16,75 @@ from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot, QFileSystemWatcher, QTim
 from ..database.log_parser import LogParser
 from ..database.stats_db import StatsDB
 from ..database.models import PlayerStats
-from ..stats.calculator import StatsCalculator
+from ..stats.calculator import StatsCalculator, parse_log_file
+
+logger = logging.getLogger(__name__)
+
+LOG_FILE_PREFIX = "pokerth-log-"
+LOG_FILE_SUFFIX = ".pdb"
+
+# Cache de la liste des logs par répertoire :
+# chemin -> (st_mtime_ns, fichiers triés, inode de chaque fichier)
+_log_files_cache: dict[str, tuple[int, list[Path], dict[Path, int]]] = {}
+
+
+def list_log_files(log_dir: Path) -> tuple[list[Path], Path | None]:
+    """Liste les fichiers de log PokerTH d'un répertoire.
+
+    La liste est mise en cache tant que la date de modification du
+    répertoire ne change pas (création, suppression ou renommage d'un fichier).
+    Le fichier le plus récent est toujours déterminé par un stat frais :
+    écrire dans un log existant ne change pas la date du répertoire.
+
+    Returns:
+        (fichiers triés par nom, fichier le plus récemment modifié ou None)
+    """
+    key = str(log_dir)
+    try:
+        mtime = os.stat(key).st_mtime_ns
+    except OSError:
+        return [], None
+
+    latest: Path | None = None
+    latest_mtime = -1
+    cached = _log_files_cache.get(key)
+    if cached is not None and cached[0] == mtime:
+        files = cached[1]
+        for path in files:
+            try:
+                entry_mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            if entry_mtime > latest_mtime:
+                latest, latest_mtime = path, entry_mtime
+        return files, latest
+
+    files = []
+    inodes: dict[Path, int] = {}
+    with os.scandir(key) as it:
+        for entry in it:
+            name = entry.name
+            if not (name.startswith(LOG_FILE_PREFIX) and name.endswith(LOG_FILE_SUFFIX)):
+                continue
+            try:
+                entry_mtime = entry.stat().st_mtime_ns
+            except OSError:
+                continue
+            path = Path(entry.path)
+            files.append(path)
+            inodes[path] = entry.inode()
+            if entry_mtime > latest_mtime:
+                latest, latest_mtime = path, entry_mtime
+    files.sort()
+
+    _log_files_cache[key] = (mtime, files, inodes)
+    return files, latest
+
+
+def _log_file_inodes(log_dir: Path) -> dict[Path, int]:
+    """Inodes des fichiers de log relevés par le dernier list_log_files(log_dir)."""
+    cached = _log_files_cache.get(str(log_dir))
+    return cached[2] if cached is not None else {}
 
 
 class LogWatcher(QObject):
@@ -29,11 +101,18 @@ class LogWatcher(QObject):
 
     # Signaux de résultat (pour les appels asynchrones depuis un autre thread)
     table_stats_ready = pyqtSignal(dict)  # Résultat de get_table_stats()
+    table_stats_ready_token = pyqtSignal(int, dict)  # Résultat d'une demande identifiée (jeton, stats)
     import_progress = pyqtSignal(int, int, str)  # Progrès import (current, total, filename)
     import_loading_stats = pyqtSignal()          # Lecture DB post-import en cours
     import_finished = pyqtSignal(int, dict)  # Résultat import (nombre de fichiers, stats)
     import_error = pyqtSignal(str)  # Erreur lors de l'import
 
+    # Signal émis quand stop() a terminé (le thread du watcher peut alors quitter)
+    finished = pyqtSignal()
+
+    # Intervalle minimal entre deux signaux import_progress (secondes)
+    _PROGRESS_INTERVAL = 0.05
+
     def __init__(
         self,
         log_dir: Path | str,
@@ -51,14 +130,27 @@ class LogWatcher(QObject):
         self.log_dir = Path(log_dir)
         self.stats_db = stats_db
         self.current_log: Path | None = None
+        # Chemin du log courant tel que passé au watcher Qt (comparé à chaque événement)
+        self._current_log_str: str | None = None
         self.parser: LogParser | None = None
         self.calculator: StatsCalculator | None = None
         self.last_action_id: int = 0
         self.current_table_players: list[str] = []
+        # Mêmes joueurs, pour les tests d'appartenance
+        self._current_table_players_set: frozenset[str] = frozenset()
         # Stats calculées pour le fichier actuel (pour calculer les deltas)
         self._current_file_stats: dict[str, PlayerStats] = {}
         # Baseline: stats du fichier courant au dernier import (évite le double-comptage)
         self._imported_file_stats: dict[str, PlayerStats] = {}
+        # Dernier résultat de get_aggregated_table_stats et sa clé
+        # (version de la base, stats du fichier courant, joueurs de la table)
+        self._aggregated_cache_key: tuple | None = None
+        self._aggregated_cache: dict[str, PlayerStats] = {}
+        # Dernières stats émises par stats_updated (pour ne pas réémettre les mêmes)
+        self._last_emitted_stats: dict[str, PlayerStats] | None = None
+        # (mtime_ns, taille) du log courant et de son -wal au dernier traitement :
+        # tant qu'elle ne change pas, un poll ne touche pas à SQLite
+        self._log_signature: tuple[int, ...] | None = None
 
         # Watcher Qt pour les fichiers (créé dans start() pour être dans le bon thread)
         self._file_watcher: QFileSystemWatcher | None = None
@@ -66,10 +158,26 @@ class LogWatcher(QObject):
         # Timer pour vérifications périodiques (créé dans start() pour être dans le bon thread)
         self._poll_timer: QTimer | None = None
         self._poll_interval = 2000  # 2 secondes
+        # Quand le watcher natif (inotify, kqueue, ...) fonctionne, le polling
+        # n'est plus qu'un filet de sécurité pour un événement manqué
+        self._fallback_poll_interval = 30000  # 30 secondes
+        # Intervalle de base courant (l'un des deux ci-dessus) ; sans activité,
+        # il est doublé à chaque poll jusqu'à _fallback_poll_interval
+        self._base_poll_interval = self._poll_interval
+        self._idle_polls = 0
+
+        # Regroupe les rafales d'événements fileChanged (une écriture SQLite de
+        # PokerTH en déclenche plusieurs) en un seul _process_updates
+        self._update_timer: QTimer | None = None
+        self._update_delay = 20  # millisecondes
+
+        # Annulation coopérative : positionné par stop(), vérifié dans les traitements longs
+        self._cancel = threading.Event()
 
     @pyqtSlot()
     def start(self) -> None:
         """Démarre la surveillance."""
+        self._cancel.clear()
         if not self.log_dir.exists():
             self.log_dir.mkdir(parents=True, exist_ok=True)
 
@@ -83,21 +191,30 @@ class LogWatcher(QObject):
         if self._poll_timer is None:
             self._poll_timer = QTimer(self)
             self._poll_timer.timeout.connect(self._poll_for_changes)
+        if self._update_timer is None:
+            self._update_timer = QTimer(self)
+            self._update_timer.setSingleShot(True)
+            self._update_timer.setInterval(self._update_delay)
+            self._update_timer.timeout.connect(self._process_updates)
 
-        # Surveille le répertoire
-        self._file_watcher.addPath(str(self.log_dir))
+        # Surveille le répertoire ; s'il ne peut pas l'être, le polling rapide prend le relais
+        watching = self._file_watcher.addPath(str(self.log_dir))
+        self._set_poll_interval(self._fallback_poll_interval if watching else self._poll_interval)
 
         # Trouve le fichier de log le plus récent
         self._find_current_log()
 
         # Démarre le polling
-        self._poll_timer.start(self._poll_interval)
+        self._poll_timer.start()
 
     @pyqtSlot()
     def stop(self) -> None:
-        """Arrête la surveillance."""
+        """Arrête la surveillance et émet finished."""
+        self._cancel.set()
         if self._poll_timer:
             self._poll_timer.stop()
+        if self._update_timer:
+            self._update_timer.stop()
         if self._file_watcher:
             if self.current_log:
                 self._file_watcher.removePath(str(self.current_log))
@@ -105,16 +222,18 @@ class LogWatcher(QObject):
         # Ferme proprement la connexion au fichier de log
         if self.parser:
             self.parser.close()
+        self.finished.emit()
+
+    def cancel(self) -> None:
+        """Demande l'arrêt des traitements en cours (import ou calcul), depuis n'importe quel thread."""
+        self._cancel.set()
 
     def _find_current_log(self) -> None:
         """Trouve le fichier de log le plus récent."""
-        pdb_files = list(self.log_dir.glob("pokerth-log-*.pdb"))
-        if not pdb_files:
+        _, latest = list_log_files(self.log_dir)
+        if latest is None:
             return
 
-        # Trie par date de modification
-        latest = max(pdb_files, key=lambda p: p.stat().st_mtime)
-
         if latest != self.current_log:
             self._switch_to_log(latest)
 
@@ -129,8 +248,10 @@ class LogWatcher(QObject):
             self._file_watcher.removePath(str(self.current_log))
 
         self.current_log = log_path
-        if self._file_watcher:
-            self._file_watcher.addPath(str(log_path))
+        self._current_log_str = str(log_path)
+        if self._file_watcher and not self._file_watcher.addPath(self._current_log_str) and self._poll_timer:
+            # Fichier non surveillable : seul le polling rapide verra ses écritures
+            self._set_poll_interval(self._poll_interval)
 
         # Initialise le parser
         self.parser = LogParser(log_path)
@@ -138,6 +259,7 @@ class LogWatcher(QObject):
 
         # Reset pour traiter tout le fichier (pas de fusion DB)
         self.last_action_id = 0
+        self._log_signature = None
         self._current_file_stats = {}
 
         # Charge le baseline si le fichier a déjà été importé (évite le double-comptage)
@@ -151,21 +273,80 @@ class LogWatcher(QObject):
     def _on_directory_changed(self, path: str) -> None:
         """Appelé quand le contenu du répertoire change."""
         self._find_current_log()
+        self._rewatch_current_log()
 
     def _on_file_changed(self, path: str) -> None:
         """Appelé quand un fichier surveillé change."""
-        if self.current_log and Path(path) == self.current_log:
+        # QFileSystemWatcher renvoie le chemin tel qu'il a été ajouté : une
+        # comparaison de chaînes suffit, sans construire de Path par événement
+        if path == self._current_log_str:
+            self._rewatch_current_log()
+            self._schedule_update()
+
+    def _rewatch_current_log(self) -> None:
+        """Surveille à nouveau le log courant s'il a été supprimé puis recréé.
+
+        QFileSystemWatcher retire un fichier de sa liste quand il disparaît ;
+        sans cela, seul le polling verrait les écritures dans le nouveau fichier.
+        """
+        if not self._file_watcher or not self._current_log_str:
+            return
+        if self._current_log_str in self._file_watcher.files():
+            return
+        if not os.path.exists(self._current_log_str):
+            return  # Pas encore recréé : l'événement du répertoire nous rappellera
+        if self._file_watcher.addPath(self._current_log_str):
+            if self._poll_timer and self._file_watcher.directories():
+                self._set_poll_interval(self._fallback_poll_interval)
+        elif self._poll_timer:
+            self._set_poll_interval(self._poll_interval)
+
+    def _schedule_update(self) -> None:
+        """Programme _process_updates ; les événements suivants sont absorbés jusqu'à son exécution."""
+        if self._update_timer is None:
             self._process_updates()
+        elif not self._update_timer.isActive():
+            self._update_timer.start()
+
+    def _set_poll_interval(self, interval: int) -> None:
+        """Définit l'intervalle de base du polling et annule le ralentissement."""
+        self._base_poll_interval = interval
+        self._idle_polls = 0
+        self._poll_timer.setInterval(interval)
 
     def _poll_for_changes(self) -> None:
-        """Vérifie périodiquement les changements."""
+        """Vérifie périodiquement les changements.
+
+        Tant que le log courant ne change pas, l'intervalle double à chaque
+        poll (jusqu'à _fallback_poll_interval) ; il revient à sa base dès
+        qu'une écriture est vue.
+        """
         self._find_current_log()
-        if self.current_log and self.parser:
-            self._process_updates()
+        if not (self.current_log and self.parser):
+            return
+
+        signature = self._read_log_signature()
+        if signature is not None and signature == self._log_signature:
+            self._idle_polls += 1
+            interval = min(
+                self._fallback_poll_interval,
+                self._base_poll_interval << min(self._idle_polls, 4),
+            )
+        else:
+            self._idle_polls = 0
+            interval = self._base_poll_interval
+            self._schedule_update()
+        if interval != self._poll_timer.interval():
+            self._poll_timer.setInterval(interval)
 
     def _process_updates(self) -> None:
         """Traite les nouvelles données de la table en cours avec agrégation DB."""
-        if not self.parser or not self.calculator:
+        if not self.parser or not self.calculator or self._cancel.is_set():
+            return
+
+        # Fichier inchangé depuis le dernier traitement : un stat() suffit
+        signature = self._read_log_signature()
+        if signature is not None and signature == self._log_signature:
             return
 
         try:
@@ -175,27 +356,59 @@ class LogWatcher(QObject):
             # Vérifie s'il y a de nouvelles actions
             current_max_action = self.parser.get_last_processed_action_id()
             if current_max_action <= self.last_action_id:
+                self._log_signature = signature
                 return
 
-            # Calcule les stats du fichier actuel uniquement (pas de fusion DB)
-            self._current_file_stats = self.calculator.calculate_all_players_stats()
+            # Met à jour les stats du fichier actuel (pas de fusion DB) : seules
+            # les mains ayant reçu de nouvelles actions sont recalculées
+            self._current_file_stats = self.calculator.update_stats(
+                self._current_file_stats, self.last_action_id
+            )
 
             # Met à jour le dernier ActionID traité (en mémoire seulement)
             self.last_action_id = current_max_action
+            if self._cancel.is_set():
+                return  # Arrêt demandé pendant le calcul : rien à émettre
 
             # Vérifie si les joueurs de la table ont changé
             new_players = self.parser.get_current_table_players()
             if new_players != self.current_table_players:
                 self.current_table_players = new_players
+                self._current_table_players_set = frozenset(new_players)
                 self.table_players_changed.emit(new_players)
 
             # Émet les stats agrégées (DB + fichier courant) pour les joueurs de la table
+            # (rien si elles sont identiques à la dernière émission, par exemple
+            # quand les nouvelles actions ne concernent que des joueurs partis)
             aggregated_stats = self.get_aggregated_table_stats()
-            self.stats_updated.emit(aggregated_stats)
+            if aggregated_stats != self._last_emitted_stats:
+                self._last_emitted_stats = aggregated_stats
+                self.stats_updated.emit(aggregated_stats)
+            # Enregistrée seulement une fois le traitement complet : après un
+            # verrou ou une annulation, le poll suivant réessaie
+            self._log_signature = signature
         except sqlite3.OperationalError:
             # La base est temporairement verrouillée par PokerTH, on réessaiera au prochain poll
             pass
 
+    def _read_log_signature(self) -> tuple[int, ...] | None:
+        """Retourne (mtime_ns, taille) du log courant et de son fichier -wal.
+
+        La taille complète un mtime de faible résolution ; le -wal est inclus
+        car en mode WAL les écritures n'atteignent le .pdb qu'au checkpoint.
+        None si le log est inaccessible (le traitement n'est alors pas court-circuité).
+        """
+        try:
+            st = os.stat(self._current_log_str)
+        except OSError:
+            return None
+        try:
+            wal = os.stat(self._current_log_str + "-wal")
+            wal_sig = (wal.st_mtime_ns, wal.st_size)
+        except OSError:
+            wal_sig = (0, 0)
+        return (st.st_mtime_ns, st.st_size, *wal_sig)
+
     def get_current_stats(self) -> dict[str, PlayerStats]:
         """Récupère les stats de tous les joueurs de la DB."""
         return self.stats_db.get_all_players_stats()
@@ -209,16 +422,38 @@ class LogWatcher(QObject):
         return {
             name: stats
             for name, stats in self._current_file_stats.items()
-            if name in self.current_table_players
+            if name in self._current_table_players_set
         }
 
     def get_aggregated_table_stats(self) -> dict[str, PlayerStats]:
-        """Récupère les stats agrégées (DB + fichier courant) pour les joueurs de la table."""
+        """Récupère les stats agrégées (DB + fichier courant) pour les joueurs de la table.
+
+        Le résultat est réutilisé tant que la base, les stats du fichier courant
+        et les joueurs de la table n'ont pas changé.
+        """
         if not self.current_table_players:
             return {}
 
+        # Les stats du fichier sont remplacées (jamais modifiées) à chaque mise à
+        # jour : l'identité du dictionnaire suffit à détecter un changement
+        key = (
+            self.stats_db.version,
+            self._current_file_stats,
+            self._imported_file_stats,
+            tuple(self.current_table_players),
+        )
+        cached_key = self._aggregated_cache_key
+        if (
+            cached_key is not None
+            and cached_key[0] == key[0]
+            and cached_key[1] is key[1]
+            and cached_key[2] is key[2]
+            and cached_key[3] == key[3]
+        ):
+            return dict(self._aggregated_cache)
+
         aggregated: dict[str, PlayerStats] = {}
-        db_stats = self.stats_db.get_all_players_stats()
+        db_stats = self.stats_db.get_players_stats(self.current_table_players)
 
         for player_name in self.current_table_players:
             db_player = db_stats.get(player_name)
@@ -229,25 +464,7 @@ class LogWatcher(QObject):
                 # Formule: DB + fichier - baseline = DB + (nouvelles mains depuis l'import)
                 # Si pas de baseline (fichier jamais importé), imp est None et on ajoute tout.
                 imp = self._imported_file_stats.get(player_name)
-                aggregated[player_name] = PlayerStats(
-                    player_name=player_name,
-                    total_hands=db_player.total_hands + file_player.total_hands - (imp.total_hands if imp else 0),
-                    vpip_hands=db_player.vpip_hands + file_player.vpip_hands - (imp.vpip_hands if imp else 0),
-                    pfr_hands=db_player.pfr_hands + file_player.pfr_hands - (imp.pfr_hands if imp else 0),
-                    total_bets=db_player.total_bets + file_player.total_bets - (imp.total_bets if imp else 0),
-                    total_calls=db_player.total_calls + file_player.total_calls - (imp.total_calls if imp else 0),
-                    three_bet_opportunities=db_player.three_bet_opportunities + file_player.three_bet_opportunities - (imp.three_bet_opportunities if imp else 0),
-                    three_bet_made=db_player.three_bet_made + file_player.three_bet_made - (imp.three_bet_made if imp else 0),
-                    cbet_opportunities=db_player.cbet_opportunities + file_player.cbet_opportunities - (imp.cbet_opportunities if imp else 0),
-                    cbet_made=db_player.cbet_made + file_player.cbet_made - (imp.cbet_made if imp else 0),
-                    fold_to_3bet_opportunities=db_player.fold_to_3bet_opportunities + file_player.fold_to_3bet_opportunities - (imp.fold_to_3bet_opportunities if imp else 0),
-                    fold_to_3bet_made=db_player.fold_to_3bet_made + file_player.fold_to_3bet_made - (imp.fold_to_3bet_made if imp else 0),
-                    fold_to_cbet_opportunities=db_player.fold_to_cbet_opportunities + file_player.fold_to_cbet_opportunities - (imp.fold_to_cbet_opportunities if imp else 0),
-                    fold_to_cbet_made=db_player.fold_to_cbet_made + file_player.fold_to_cbet_made - (imp.fold_to_cbet_made if imp else 0),
-                    hands_saw_flop=db_player.hands_saw_flop + file_player.hands_saw_flop - (imp.hands_saw_flop if imp else 0),
-                    hands_went_to_showdown=db_player.hands_went_to_showdown + file_player.hands_went_to_showdown - (imp.hands_went_to_showdown if imp else 0),
-                    showdowns_won=db_player.showdowns_won + file_player.showdowns_won - (imp.showdowns_won if imp else 0),
-                )
+                aggregated[player_name] = db_player + file_player - (imp or PlayerStats.ZERO)
             elif db_player:
                 # Seulement dans la DB
                 aggregated[player_name] = db_player
@@ -255,7 +472,9 @@ class LogWatcher(QObject):
                 # Seulement dans le fichier courant
                 aggregated[player_name] = file_player
 
-        return aggregated
+        self._aggregated_cache_key = key
+        self._aggregated_cache = aggregated
+        return dict(aggregated)
 
     def force_refresh(self) -> None:
         """Force un rafraîchissement complet des stats."""
@@ -263,102 +482,123 @@ class LogWatcher(QObject):
         all_db_stats = self.stats_db.get_all_players_stats()
         self.stats_updated.emit(all_db_stats)
 
-    def save_pending_stats(self) -> None:
+    def save_pending_stats(self) -> dict[str, PlayerStats]:
         """Persiste le delta du fichier courant dans la DB (mains jouées depuis le dernier import).
 
         À appeler après l'arrêt du thread du watcher, avant de détruire l'instance.
+
+        Returns:
+            Totaux en base, après fusion, des joueurs du fichier courant
         """
         if not self.current_log or not self._current_file_stats:
-            return
+            return {}
 
+        deltas: list[PlayerStats] = []
         for player_name, file_stats in self._current_file_stats.items():
             imported_stats = self._imported_file_stats.get(player_name)
-            if imported_stats:
-                # Calcule le delta champ par champ (nouvelles mains depuis l'import)
-                delta_kwargs: dict = {"player_name": player_name}
-                for f in dataclass_fields(PlayerStats):
-                    if f.name == "player_name":
-                        continue
-                    delta_kwargs[f.name] = getattr(file_stats, f.name) - getattr(imported_stats, f.name)
-                self.stats_db.merge_stats(PlayerStats(**delta_kwargs))
-            else:
+            if imported_stats is None:
                 # Pas de baseline; toutes les stats sont nouvelles
-                self.stats_db.merge_stats(file_stats)
-
-        # Met à jour le baseline avec les stats actuelles du fichier
-        stats_json = json.dumps({name: asdict(stats) for name, stats in self._current_file_stats.items()})
-        self.stats_db.set_last_processed_action(str(self.current_log), self.last_action_id, stats_json)
+                deltas.append(file_stats)
+            elif file_stats != imported_stats:
+                # Delta champ par champ (nouvelles mains depuis l'import)
+                deltas.append(file_stats - imported_stats)
+
+        # Un seul commit : les deltas et le nouveau baseline sont écrits ensemble
+        with self.stats_db.transaction():
+            self.stats_db.merge_all_stats(deltas)
+            saved = self.stats_db.get_players_stats(self._current_file_stats)
+
+            # Met à jour le baseline avec les stats actuelles du fichier
+            self.stats_db.set_last_processed_action(
+                str(self.current_log), self.last_action_id, self._current_file_stats
+            )
         self._imported_file_stats = dict(self._current_file_stats)
+        return saved
 
-    def import_all_logs(self, progress_callback: Callable[[int, int, str], None] | None = None) -> int:
+    def import_all_logs(
+        self,
+        progress_callback: Callable[[int, int, str], None] | None = None,
+        batch_size: int = 100,
+    ) -> int:
         """Importe les fichiers .pdb du répertoire de logs.
 
+        Les fichiers modifiés depuis le dernier import sont analysés en
+        parallèle dans des processus séparés ; l'écriture en base reste
+        séquentielle dans ce thread, par transactions de batch_size fichiers.
+
         Args:
             progress_callback: Fonction appelée avec (current, total, filename) pour le progrès
+            batch_size: Nombre de fichiers enregistrés par transaction SQLite
 
         Returns:
             Nombre de fichiers importés
         """
         since = getattr(self, '_import_since', None)
-        all_files = sorted(self.log_dir.glob("pokerth-log-*.pdb"))
+        all_files, _ = list_log_files(self.log_dir)
         if since is not None:
             from datetime import datetime
             pdb_files = [f for f in all_files if datetime.fromtimestamp(f.stat().st_mtime) >= since]
         else:
-            pdb_files = all_files
+            pdb_files = list(all_files)
+        # Ordre des inodes : approche l'ordre sur disque, donc des lectures
+        # plus séquentielles à froid sur un disque dur (sans effet sur un SSD).
+        # Les inodes viennent du parcours scandir : aucun stat supplémentaire
+        inodes = _log_file_inodes(self.log_dir)
+        pdb_files.sort(key=lambda pdb_file: inodes.get(pdb_file, 0))
         total = len(pdb_files)
         imported = 0
-
-        for i, pdb_file in enumerate(pdb_files):
+        done = 0
+
+        # Repère les fichiers ayant de nouvelles actions (lecture rapide du dernier ActionID)
+        pending: list[Path] = []
+        for pdb_file, current_max in LogParser.last_action_ids(pdb_files):
+            if self._cancel.is_set():
+                return imported
+            if isinstance(current_max, Exception):
+                logger.error("Erreur lors de l'import de %s: %s", pdb_file.name, current_max)
+            elif current_max > self.stats_db.get_last_processed_action(str(pdb_file)):
+                pending.append(pdb_file)
+                continue
+
+            # Fichier déjà à jour (ou illisible) — rien à faire
+            done += 1
             if progress_callback:
-                progress_callback(i + 1, total, pdb_file.name)
-
-            try:
-                parser = LogParser(pdb_file)
-                current_max = parser.get_last_processed_action_id()
-                stored_max = self.stats_db.get_last_processed_action(str(pdb_file))
-
-                if current_max <= stored_max:
-                    # Fichier déjà à jour — rien à faire
-                    parser.close()
-                    continue
-
-                # Calcule les nouvelles stats complètes du fichier
-                calculator = StatsCalculator(parser)
-                new_file_stats = calculator.calculate_all_players_stats()
-
-                # Soustrait l'ancienne contribution de ce fichier (si déjà importé)
-                old_file_stats = self.stats_db.get_imported_file_stats(str(pdb_file))
-                if old_file_stats:
-                    for old_stats in old_file_stats.values():
-                        self.stats_db.subtract_stats(old_stats)
-
-                # Ajoute les nouvelles stats
-                for stats in new_file_stats.values():
-                    self.stats_db.merge_stats(stats)
-
-                # Soustrait les anciennes ranges de ce fichier (si déjà importées)
-                old_file_ranges = self.stats_db.get_file_ranges(str(pdb_file))
-                if old_file_ranges:
-                    self.stats_db.subtract_file_ranges(old_file_ranges)
-
-                # Calcule et stocke les nouvelles ranges
-                new_file_ranges: dict[str, list] = {}
-                for player_name in new_file_stats:
-                    combos = parser.get_player_vpip_combos(player_name)
-                    new_file_ranges[player_name] = [list(c) for c in combos]
-                    self.stats_db.merge_player_combos(player_name, combos)
-
-                # Persiste les métadonnées du fichier
-                stats_json = json.dumps({name: asdict(s) for name, s in new_file_stats.items()})
-                ranges_json = json.dumps(new_file_ranges)
-                self.stats_db.set_last_processed_action(str(pdb_file), current_max, stats_json, ranges_json)
-
-                parser.close()
-                imported += 1
-
-            except Exception as e:
-                print(f"Erreur lors de l'import de {pdb_file.name}: {e}")
+                progress_callback(done, total, pdb_file.name)
+
+        if pending:
+            # "spawn" : pas de fork d'un processus qui fait tourner des threads Qt
+            with ProcessPoolExecutor(
+                max_workers=min(len(pending), os.cpu_count() or 1),
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                futures = {executor.submit(parse_log_file, str(pdb_file)): pdb_file for pdb_file in pending}
+                # Résultats traités dans l'ordre de fin d'analyse : un gros fichier
+                # ne bloque pas la progression des autres
+                parsed = []
+                for future in as_completed(futures):
+                    if self._cancel.is_set():
+                        break
+                    pdb_file = futures[future]
+                    try:
+                        parsed.append((pdb_file, future.result()))
+                    except Exception:
+                        logger.exception("Erreur lors de l'import de %s", pdb_file.name)
+
+                    done += 1
+                    if progress_callback:
+                        progress_callback(done, total, pdb_file.name)
+
+                    if len(parsed) >= batch_size:
+                        imported += self._store_imported_batch(parsed)
+                        parsed = []
+
+                # Dernier lot, y compris les fichiers déjà analysés en cas d'annulation
+                if parsed:
+                    imported += self._store_imported_batch(parsed)
+
+                if self._cancel.is_set():
+                    # Abandonne les analyses pas encore démarrées
+                    executor.shutdown(cancel_futures=True)
 
         # Met à jour le last_action_id pour le fichier actuel si on le surveille
         if self.current_log:
@@ -366,17 +606,82 @@ class LogWatcher(QObject):
 
         return imported
 
+    def _store_imported_batch(self, parsed: list[tuple[Path, tuple]]) -> int:
+        """Écrit un lot de fichiers analysés en une seule transaction (un seul commit disque).
+
+        Chaque fichier est écrit dans un savepoint : un échec au milieu de son
+        enregistrement annule toutes ses écritures, sans toucher aux autres
+        fichiers du lot.
+
+        Returns:
+            Nombre de fichiers enregistrés
+        """
+        stored = 0
+        with self.stats_db.transaction():
+            for pdb_file, (current_max, new_file_stats, new_file_ranges) in parsed:
+                try:
+                    with self.stats_db.savepoint():
+                        self._store_imported_file(pdb_file, current_max, new_file_stats, new_file_ranges)
+                    stored += 1
+                except Exception:
+                    logger.exception("Erreur lors de l'import de %s", pdb_file.name)
+        return stored
+
+    def _store_imported_file(
+        self,
+        pdb_file: Path,
+        current_max: int,
+        new_file_stats: dict[str, PlayerStats],
+        new_file_ranges: dict[str, list],
+    ) -> None:
+        """Remplace la contribution d'un fichier de log dans la base par ses nouvelles stats."""
+        # Soustrait l'ancienne contribution de ce fichier (si déjà importé)
+        old_file_stats = self.stats_db.get_imported_file_stats(str(pdb_file))
+        if old_file_stats:
+            self.stats_db.subtract_all_stats(old_file_stats.values())
+
+        # Ajoute les nouvelles stats
+        self.stats_db.merge_all_stats(new_file_stats.values())
+
+        # Soustrait les anciennes ranges de ce fichier (si déjà importées)
+        old_file_ranges = self.stats_db.get_file_ranges(str(pdb_file))
+        if old_file_ranges:
+            self.stats_db.subtract_file_ranges(old_file_ranges)
+
+        # Ajoute les nouvelles ranges
+        for player_name, combos in new_file_ranges.items():
+            self.stats_db.merge_player_combos(player_name, combos)
+
+        # Persiste les métadonnées du fichier
+        ranges_json = json.dumps(new_file_ranges)
+        self.stats_db.set_last_processed_action(str(pdb_file), current_max, new_file_stats, ranges_json)
+
     @pyqtSlot()
     def request_table_stats(self) -> None:
         """Calcule les stats agrégées de la table et émet table_stats_ready (appel asynchrone)."""
         stats = self.get_aggregated_table_stats()
         self.table_stats_ready.emit(stats)
 
+    @pyqtSlot(int)
+    def request_table_stats_for(self, token: int) -> None:
+        """Comme request_table_stats, mais émet table_stats_ready_token avec le jeton du demandeur."""
+        stats = self.get_aggregated_table_stats()
+        self.table_stats_ready_token.emit(token, stats)
+
     @pyqtSlot()
     def request_import_all_logs(self) -> None:
         """Importe tous les logs et émet les signaux de progression (appel asynchrone)."""
         try:
+            last_emit = 0.0
+
             def progress_callback(current: int, total: int, filename: str) -> None:
+                # Limite les signaux (et donc les repaints du dialogue) à un toutes les
+                # _PROGRESS_INTERVAL secondes ; le dernier fichier est toujours signalé
+                nonlocal last_emit
+                now = time.monotonic()
+                if current < total and now - last_emit < self._PROGRESS_INTERVAL:
+                    return
+                last_emit = now
                 self.import_progress.emit(current, total, filename)
 
             imported = self.import_all_logs(progress_callback)